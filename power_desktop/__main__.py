@@ -1,9 +1,14 @@
+from power_desktop.tools import startup_profile
+
+startup_profile.install()
+
 from threading import Event
 import traceback
 from power_desktop.layout_kw import PowerDesktopLayout
 from power_desktop.tools.logs import setup_logs
 
 setup_logs()
+startup_profile.mark("imported")
 
 
 def postmortem_debug(ex: BaseException):
@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from typing import Callable, Protocol
+from uuid import UUID
+
+type DesktopId = UUID
+
+
+class UnknownDesktopError(KeyError):
+    """
+    Raised for a desktop that doesn't exist, usually one that was removed
+    since the desktops were last listed.
+    """
+
+
+@dataclass(frozen=True)
+class DesktopInfo:
+    id: DesktopId
+    name: str
+
+
+@dataclass(frozen=True)
+class WindowInfo:
+    hwnd: int
+    pid: int
+    title: str
+
+
+class DesktopBackend(Protocol):
+    """
+    Everything PowerDesktops needs from the OS to list, switch and move
+    between virtual desktops.
+
+    Desktops are identified by their GUID, windows by their hwnd.
+    """
+
+    @property
+    def transient_errors(self) -> tuple[type[BaseException], ...]:
+        """
+        Errors after which `recover()` should be called and the call retried.
+        """
+        ...
+
+    @property
+    def concurrent_moves(self) -> bool:
+        """
+        Whether `move_window` may be called from several threads at once.
+        """
+        ...
+
+    def list_desktops(self) -> tuple[DesktopInfo, ...]: ...
+
+    def current_desktop(self) -> DesktopId: ...
+
+    def switch_to(self, desktop: DesktopId) -> None: ...
+
+    def focused_window(self) -> WindowInfo: ...
+
+    def list_windows(self, pid: int | None = None) -> tuple[WindowInfo, ...]:
+        """
+        Lists top-level windows, optionally only those of one process.
+        """
+        ...
+
+    def move_window(self, hwnd: int, desktop: DesktopId) -> None: ...
+
+    def subscribe_desktop_changes(
+        self, callback: Callable[[DesktopId], None]
+    ) -> Callable[[], None] | None:
+        """
+        Calls `callback` with the current desktop whenever it changes or
+        desktops are added or removed, from any thread. Returns a function
+        that unsubscribes, or None if the backend can't deliver
+        notifications.
+        """
+        ...
+
+    def window_desktops(self) -> dict[int, DesktopId]:
+        """
+        Maps every window that's on a desktop to it, in one full scan.
+        """
+        ...
+
+    def subscribe_window_changes(
+        self, callback: Callable[[int, DesktopId | None], None]
+    ) -> Callable[[], None] | None:
+        """
+        Calls `callback(hwnd, desktop)` when a top-level window appears and
+        `callback(hwnd, None)` when one goes away, from any thread. Returns
+        a function that unsubscribes, or None if the backend can't deliver
+        notifications.
+        """
+        ...
+
+    def warm_up(self) -> None:
+        """
+        Loads whatever the backend would otherwise load on first use.
+        """
+        ...
+
+    def recover(self) -> None:
+        """
+        Rebuilds whatever connection to the OS the backend holds.
+        """
+        ...
@@ -0,0 +1,115 @@
+from concurrent.futures import Future
+from threading import get_ident
+from typing import Any, Callable
+
+from power_desktop.backend.base import (
+    DesktopBackend,
+    DesktopId,
+    DesktopInfo,
+    WindowInfo,
+)
+from power_desktop.util.event_loop import create_event_loop
+
+
+def co_initialize() -> None:
+    """
+    Enters a single-threaded COM apartment, which is what pyvda expects.
+    """
+    import comtypes  # type: ignore
+
+    comtypes.CoInitializeEx(comtypes.COINIT_APARTMENTTHREADED)  # type: ignore
+
+
+class ComWorker:
+    """
+    A long-lived thread that runs calls submitted from other threads, one at
+    a time and in order.
+
+    Objects created on it stay on it, so COM interface pointers never cross
+    apartments. Calls made from the worker itself run inline.
+    """
+
+    def __init__(
+        self,
+        name: str = "com",
+        initializer: Callable[[], None] | None = None,
+    ):
+        self._loop = create_event_loop(name, initializer=initializer)
+        self._ident = self.submit(get_ident).result()
+
+    @property
+    def on_worker(self) -> bool:
+        return get_ident() == self._ident
+
+    def submit[R](self, func: Callable[..., R], *args: Any) -> Future[R]:
+        future: Future[R] = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+        self._loop.call_soon_threadsafe(run)
+        return future
+
+    def call[R](self, func: Callable[..., R], *args: Any) -> R:
+        if self.on_worker:
+            return func(*args)
+        return self.submit(func, *args).result()
+
+
+class ComThreadBackend:
+    """
+    Forwards every call to a backend that lives on a ComWorker.
+    """
+
+    # Every call runs on the one worker thread, so moves issued together
+    # would only queue up behind each other.
+    concurrent_moves = False
+
+    def __init__(self, worker: ComWorker, inner: DesktopBackend):
+        self._worker = worker
+        self._inner = inner
+        self.transient_errors = inner.transient_errors
+
+    def list_desktops(self) -> tuple[DesktopInfo, ...]:
+        return self._worker.call(self._inner.list_desktops)
+
+    def current_desktop(self) -> DesktopId:
+        return self._worker.call(self._inner.current_desktop)
+
+    def switch_to(self, desktop: DesktopId) -> None:
+        self._worker.call(self._inner.switch_to, desktop)
+
+    def focused_window(self) -> WindowInfo:
+        return self._worker.call(self._inner.focused_window)
+
+    def list_windows(self, pid: int | None = None) -> tuple[WindowInfo, ...]:
+        return self._worker.call(self._inner.list_windows, pid)
+
+    def move_window(self, hwnd: int, desktop: DesktopId) -> None:
+        self._worker.call(self._inner.move_window, hwnd, desktop)
+
+    def subscribe_desktop_changes(
+        self, callback: Callable[[DesktopId], None]
+    ) -> Callable[[], None] | None:
+        return self._worker.call(
+            self._inner.subscribe_desktop_changes, callback
+        )
+
+    def window_desktops(self) -> dict[int, DesktopId]:
+        return self._worker.call(self._inner.window_desktops)
+
+    def subscribe_window_changes(
+        self, callback: Callable[[int, DesktopId | None], None]
+    ) -> Callable[[], None] | None:
+        return self._worker.call(self._inner.subscribe_window_changes, callback)
+
+    def warm_up(self) -> None:
+        self._worker.call(self._inner.warm_up)
+
+    def recover(self) -> None:
+        self._worker.call(self._inner.recover)
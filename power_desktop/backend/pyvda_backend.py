@@ -0,0 +1,218 @@
+# pyright: standard
+import logging
+from _ctypes import COMError  # type: ignore
+from typing import TYPE_CHECKING, Callable
+from uuid import UUID
+
+from pyvda import (
+    AppView,
+    VirtualDesktop,
+    get_apps_by_z_order,
+    get_virtual_desktops,
+)
+
+from power_desktop.backend.base import (
+    DesktopId,
+    DesktopInfo,
+    UnknownDesktopError,
+    WindowInfo,
+)
+from power_desktop.backend.com_worker import ComWorker
+from power_desktop.util.connection_cache import ConnectionCache
+from power_desktop.util.win_events import (
+    CHILDID_SELF,
+    EVENT_OBJECT_DESTROY,
+    EVENT_OBJECT_SHOW,
+    EVENT_SYSTEM_FOREGROUND,
+    OBJID_WINDOW,
+    is_app_window,
+    watch_win_events,
+)
+
+if TYPE_CHECKING:
+    from pywinauto import Application
+    from pywinauto.win32_element_info import HwndElementInfo
+
+logger = logging.getLogger("power_desktop")
+
+
+def _to_id(guid: object) -> DesktopId:
+    return UUID(str(guid))
+
+
+def _window_info(hinfo: "HwndElementInfo") -> WindowInfo:
+    return WindowInfo(hinfo.handle, hinfo.process_id, hinfo.name)
+
+
+def _connect(pid: int) -> "Application":
+    from pywinauto import Application
+
+    return Application().connect(process=pid)
+
+
+class PyvdaBackend:
+    """
+    The real backend: pyvda for desktops, pywinauto for window discovery.
+    pywinauto is slow to import and only needed to move windows, so it's
+    imported on first use or by `warm_up()`.
+
+    pyvda's COM objects belong to the thread that created the backend. When
+    that's a ComWorker, pass it so callbacks from other threads go through
+    it.
+    """
+
+    transient_errors = (COMError,)
+    concurrent_moves = False
+
+    def __init__(self, worker: ComWorker | None = None):
+        self._worker = worker
+        self._desktops: dict[DesktopId, VirtualDesktop] = {}
+        # Connecting is the slowest part of finding an editor's windows.
+        self.apps = ConnectionCache(
+            _connect,
+            lambda app: app.is_process_running(),
+        )
+        # pyvda creates its managers in whichever thread imported it. Rebuild
+        # them here, on the thread that owns this backend.
+        self.recover()
+
+    def _on_owner[R](self, func: Callable[..., R], *args: object) -> R:
+        """
+        Runs `func` on the thread that owns the COM objects.
+        """
+        if self._worker:
+            return self._worker.call(func, *args)
+        return func(*args)
+
+    def _vd(self, desktop: DesktopId) -> VirtualDesktop:
+        vd = self._desktops.get(desktop)
+        if vd is None:
+            self.list_desktops()
+            vd = self._desktops.get(desktop)
+            if vd is None:
+                raise UnknownDesktopError(desktop)
+        return vd
+
+    def list_desktops(self) -> tuple[DesktopInfo, ...]:
+        desktops = get_virtual_desktops()
+        self._desktops = {_to_id(vd.id): vd for vd in desktops}
+        return tuple(
+            DesktopInfo(_to_id(vd.id), str(i))
+            for i, vd in enumerate(desktops, 1)
+        )
+
+    def current_desktop(self) -> DesktopId:
+        return _to_id(VirtualDesktop.current().id)
+
+    def _desktop_state(self) -> tuple[DesktopId, int]:
+        """
+        The current desktop and how many there are, without listing them.
+        """
+        import pyvda.pyvda
+
+        desktops = pyvda.pyvda.managers.manager_internal.get_all_desktops()  # type: ignore
+        count: int = desktops.GetCount()  # type: ignore
+        return self.current_desktop(), count
+
+    def switch_to(self, desktop: DesktopId) -> None:
+        self._vd(desktop).go()
+
+    def focused_window(self) -> WindowInfo:
+        from pywinauto.win32_element_info import HwndElementInfo
+
+        return _window_info(HwndElementInfo(AppView.current().hwnd))
+
+    def list_windows(self, pid: int | None = None) -> tuple[WindowInfo, ...]:
+        if pid is None:
+            from pywinauto.findwindows import find_elements
+
+            return tuple(
+                _window_info(x) for x in find_elements(top_level_only=True)
+            )
+        app = self.apps.get(pid)
+        try:
+            windows = app.windows()
+        except Exception:
+            self.apps.evict(pid)
+            raise
+        return tuple(
+            WindowInfo(w.handle, pid, w.window_text()) for w in windows
+        )
+
+    def move_window(self, hwnd: int, desktop: DesktopId) -> None:
+        AppView(hwnd).move(self._vd(desktop))
+
+    def subscribe_desktop_changes(
+        self, callback: Callable[[DesktopId], None]
+    ) -> Callable[[], None] | None:
+        # pyvda has no desktop notifications, but a switch always moves the
+        # foreground, so the desktops only need checking then. Counting them
+        # is cheap, and catches desktops added or removed in Task View.
+        last = self._desktop_state()
+
+        def on_foreground(event: int, hwnd: int, obj: int, child: int):
+            nonlocal last
+            try:
+                state = self._on_owner(self._desktop_state)
+            except self.transient_errors as e:
+                logger.warning(f"Couldn't read current desktop: {e}")
+                return
+            if state != last:
+                last = state
+                callback(state[0])
+
+        return watch_win_events(
+            EVENT_SYSTEM_FOREGROUND,
+            EVENT_SYSTEM_FOREGROUND,
+            on_foreground,
+            name="desktop-changes",
+        )
+
+    def window_desktops(self) -> dict[int, DesktopId]:
+        desktops: dict[int, DesktopId] = {}
+        for view in get_apps_by_z_order(current_desktop=False):
+            try:
+                desktops[view.hwnd] = _to_id(view.desktop_id)
+            except COMError:
+                # Pinned, or closed since it was listed.
+                continue
+        return desktops
+
+    def subscribe_window_changes(
+        self, callback: Callable[[int, DesktopId | None], None]
+    ) -> Callable[[], None] | None:
+        def desktop_of(hwnd: int) -> DesktopId:
+            return _to_id(AppView(hwnd).desktop_id)
+
+        def on_window(event: int, hwnd: int, obj: int, child: int):
+            if not hwnd or obj != OBJID_WINDOW or child != CHILDID_SELF:
+                return
+            if event == EVENT_OBJECT_DESTROY:
+                callback(hwnd, None)
+                return
+            # Controls and popups show too; skip them before asking COM.
+            if not is_app_window(hwnd):
+                return
+            try:
+                desktop = self._on_owner(desktop_of, hwnd)
+            except self.transient_errors:
+                # Not an application window.
+                return
+            callback(hwnd, desktop)
+
+        return watch_win_events(
+            EVENT_OBJECT_DESTROY,
+            EVENT_OBJECT_SHOW,
+            on_window,
+            name="window-changes",
+        )
+
+    def warm_up(self) -> None:
+        import pywinauto.findwindows
+        import pywinauto.win32_element_info
+
+    def recover(self) -> None:
+        import pyvda.pyvda
+
+        pyvda.pyvda.managers.__init__()  # type: ignore
+        self._desktops = {}
@@ -0,0 +1,42 @@
+import os
+
+from power_desktop.backend.base import DesktopBackend
+
+_backend: DesktopBackend | None = None
+
+
+def _default_backend() -> DesktopBackend:
+    match os.environ.get("POWER_DESKTOP_BACKEND", "pyvda"):
+        case "simulated":
+            from power_desktop.backend.simulated import SimulatedBackend
+
+            return SimulatedBackend()
+        case "pyvda":
+            from power_desktop.backend.com_worker import (
+                ComThreadBackend,
+                ComWorker,
+                co_initialize,
+            )
+            from power_desktop.backend.pyvda_backend import PyvdaBackend
+
+            # All pyvda and pywinauto calls happen on this one thread.
+            worker = ComWorker("com", initializer=co_initialize)
+            return ComThreadBackend(worker, worker.call(PyvdaBackend, worker))
+        case other:
+            raise ValueError(f"Unknown backend {other!r}")
+
+
+def get_backend() -> DesktopBackend:
+    """
+    Returns the process-wide backend, creating the default one on first use.
+    Set POWER_DESKTOP_BACKEND=simulated to run without a Windows session.
+    """
+    global _backend
+    if _backend is None:
+        _backend = _default_backend()
+    return _backend
+
+
+def use_backend(backend: DesktopBackend) -> None:
+    global _backend
+    _backend = backend
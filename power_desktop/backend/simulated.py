@@ -0,0 +1,238 @@
+from collections import Counter
+from collections.abc import Mapping
+from threading import RLock
+from typing import Callable
+from time import sleep
+from uuid import uuid4
+
+from power_desktop.backend.base import (
+    DesktopId,
+    DesktopInfo,
+    UnknownDesktopError,
+    WindowInfo,
+)
+
+
+class SimulatedComError(Exception):
+    """
+    Stands in for `_ctypes.COMError`, which only exists on Windows.
+    """
+
+
+class SimulatedBackend:
+    """
+    In-memory desktops and windows, for running the command pipeline without
+    a Windows session.
+
+    `latency` is the time each call takes, either for all calls or per method
+    name. With `fail_every=N`, every Nth call raises SimulatedComError until
+    `recover()` is called, like a COM server going away.
+    """
+
+    transient_errors = (SimulatedComError,)
+    concurrent_moves = True
+
+    def __init__(
+        self,
+        desktops: int = 4,
+        latency: float | Mapping[str, float] = 0.0,
+        fail_every: int | None = None,
+    ):
+        self._lock = RLock()
+        self._latency = latency
+        self._fail_every = fail_every
+        self._failed = False
+        self._desktops: list[DesktopId] = [uuid4() for _ in range(desktops)]
+        self._current = self._desktops[0]
+        self._windows: dict[int, tuple[WindowInfo, DesktopId]] = {}
+        self._focused: int | None = None
+        self._next_hwnd = 0x10000
+        self._listeners: list[Callable[[DesktopId], None]] = []
+        self._window_listeners: list[
+            Callable[[int, DesktopId | None], None]
+        ] = []
+        self.calls: Counter[str] = Counter()
+        self.recoveries = 0
+
+    def _set_current(self, desktop: DesktopId, force: bool = False) -> None:
+        with self._lock:
+            changed = force or self._current != desktop
+            self._current = desktop
+            listeners = tuple(self._listeners)
+        if changed:
+            for listener in listeners:
+                listener(desktop)
+
+    def _window_changed(self, hwnd: int, desktop: DesktopId | None) -> None:
+        with self._lock:
+            listeners = tuple(self._window_listeners)
+        for listener in listeners:
+            listener(hwnd, desktop)
+
+    def _call(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+            total = self.calls.total()
+            if self._failed or (
+                self._fail_every and total % self._fail_every == 0
+            ):
+                self._failed = True
+                raise SimulatedComError(f"Simulated COM failure in {name}")
+        latency = (
+            self._latency.get(name, 0.0)
+            if isinstance(self._latency, Mapping)
+            else self._latency
+        )
+        if latency:
+            sleep(latency)
+
+    # Scenario setup. These don't count as backend calls.
+    # =========================================
+    @property
+    def desktop_ids(self) -> tuple[DesktopId, ...]:
+        with self._lock:
+            return tuple(self._desktops)
+
+    def add_desktop(self) -> DesktopId:
+        with self._lock:
+            desktop = uuid4()
+            self._desktops.append(desktop)
+            current = self._current
+        self._set_current(current, force=True)
+        return desktop
+
+    def remove_desktop(self, desktop: DesktopId) -> None:
+        with self._lock:
+            position = self._desktops.index(desktop)
+            self._desktops.remove(desktop)
+            fallback = self._desktops[max(position - 1, 0)]
+            for hwnd, (info, on) in self._windows.items():
+                if on == desktop:
+                    self._windows[hwnd] = (info, fallback)
+            current = fallback if self._current == desktop else self._current
+        self._set_current(current, force=True)
+
+    def add_window(
+        self, pid: int, title: str, desktop: DesktopId | None = None
+    ) -> WindowInfo:
+        with self._lock:
+            info = WindowInfo(self._next_hwnd, pid, title)
+            self._next_hwnd += 4
+            desktop = desktop or self._current
+            self._windows[info.hwnd] = (info, desktop)
+            self._focused = self._focused or info.hwnd
+        self._window_changed(info.hwnd, desktop)
+        return info
+
+    def close_window(self, hwnd: int) -> None:
+        with self._lock:
+            del self._windows[hwnd]
+            if self._focused == hwnd:
+                self._focused = next(iter(self._windows), None)
+        self._window_changed(hwnd, None)
+
+    def move_externally(self, hwnd: int, desktop: DesktopId) -> None:
+        """
+        A move made from Task View, which Windows doesn't notify about.
+        """
+        with self._lock:
+            info, _ = self._windows[hwnd]
+            self._windows[hwnd] = (info, desktop)
+
+    def focus(self, hwnd: int) -> None:
+        with self._lock:
+            self._focused = hwnd
+
+    def desktop_of(self, hwnd: int) -> DesktopId:
+        with self._lock:
+            return self._windows[hwnd][1]
+
+    def switch_externally(self, desktop: DesktopId) -> None:
+        """
+        A switch made by the user without going through PowerDesktops.
+        """
+        self._set_current(desktop)
+
+    # DesktopBackend
+    # =========================================
+    def list_desktops(self) -> tuple[DesktopInfo, ...]:
+        self._call("list_desktops")
+        with self._lock:
+            return tuple(
+                DesktopInfo(id, str(i))
+                for i, id in enumerate(self._desktops, 1)
+            )
+
+    def current_desktop(self) -> DesktopId:
+        self._call("current_desktop")
+        return self._current
+
+    def switch_to(self, desktop: DesktopId) -> None:
+        self._call("switch_to")
+        with self._lock:
+            if desktop not in self._desktops:
+                raise UnknownDesktopError(desktop)
+        self._set_current(desktop)
+
+    def focused_window(self) -> WindowInfo:
+        self._call("focused_window")
+        with self._lock:
+            if self._focused is None:
+                raise SimulatedComError("No focused window")
+            return self._windows[self._focused][0]
+
+    def list_windows(self, pid: int | None = None) -> tuple[WindowInfo, ...]:
+        self._call("list_windows")
+        with self._lock:
+            return tuple(
+                info
+                for info, _ in self._windows.values()
+                if pid is None or info.pid == pid
+            )
+
+    def move_window(self, hwnd: int, desktop: DesktopId) -> None:
+        self._call("move_window")
+        with self._lock:
+            if desktop not in self._desktops:
+                raise UnknownDesktopError(desktop)
+            info, _ = self._windows[hwnd]
+            self._windows[hwnd] = (info, desktop)
+
+    def subscribe_desktop_changes(
+        self, callback: Callable[[DesktopId], None]
+    ) -> Callable[[], None] | None:
+        with self._lock:
+            self._listeners.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._listeners.remove(callback)
+
+        return unsubscribe
+
+    def window_desktops(self) -> dict[int, DesktopId]:
+        self._call("window_desktops")
+        with self._lock:
+            return {
+                hwnd: desktop for hwnd, (_, desktop) in self._windows.items()
+            }
+
+    def subscribe_window_changes(
+        self, callback: Callable[[int, DesktopId | None], None]
+    ) -> Callable[[], None] | None:
+        with self._lock:
+            self._window_listeners.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._window_listeners.remove(callback)
+
+        return unsubscribe
+
+    def warm_up(self) -> None:
+        pass
+
+    def recover(self) -> None:
+        with self._lock:
+            self._failed = False
+            self.recoveries += 1
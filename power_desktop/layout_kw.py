@@ -1,7 +1,7 @@
 from logging import getLogger
 import os
-from time import sleep
-from typing import Any
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Any, Callable
 
 from keyweave import (
     key,
@@ -9,162 +9,443 @@ from keyweave import (
     HotkeyEvent,
 )
 
-from power_desktop.tools.exec_reinit_vda_managers import (
-    exec_reinit_vda_managers,
-    wrap_reinit_vda_managers,
-)
+from power_desktop.backend.selection import get_backend
+from power_desktop.tools.exec_reinit_vda_managers import RecoveringBackend
 from power_desktop.model.model_1d import (
     Desktop1D,
     Index1D,
+    VdHistoryEntry,
+)
+from power_desktop.model.bulk_moves import (
+    BulkPlan,
+    plan_evacuate,
+    plan_gather,
+    plan_swap,
 )
+from power_desktop.model.model_2d import columns_from_env
+from power_desktop.model.window_inventory import WindowInventory
+from power_desktop.backend.base import DesktopId
+from power_desktop.tools.batch_move import MoveReport, move_batch
+from power_desktop.tools.command_pipeline import CommandPipeline, Step
+from power_desktop.tools.history_journal import HistoryJournal
+from power_desktop.tools.history_tracker import HistoryTracker
+from power_desktop.tools.logs import stop_logs
+from power_desktop.tools.metrics import dump_metrics, serve_metrics_from_env
+from power_desktop.tools.mru_index import MruIndex
+from power_desktop.tools.tracing import dump_chrome, dump_jsonl, span
+from power_desktop.tools import startup_profile
 from power_desktop.tools.undo_buffer import UndoBuffer
 from power_desktop.util.str import get_number_emoji
-from power_desktop.util.windows import get_related_windows
-from power_desktop.tools.disable_caps import force_caps_off
-from pyvda import AppView  # pyright: ignore[reportMissingTypeStubs]
-from react_tk import WindowRoot
 from keyweave import (
     LayoutClass,
     HotkeyInterceptionEvent,
 )
 from power_desktop.ui.desktop_status import (
+    DesktopAction,
     DesktopActionFail,
     DesktopActionOkay,
+    Bulk,
     Pan,
     ProgramStarted,
     ProgramStopping,
     Shove,
 )
-from apscheduler.schedulers.background import (  # pyright: ignore[reportMissingTypeStubs]
-    BackgroundScheduler,
-)
+
+if TYPE_CHECKING:
+    from react_tk import WindowRoot
 
 logger = getLogger("power_desktop")
 
+# Run right away on the hotkey thread, so they work while COM is down or
+# the pipeline is backed up.
+_INLINE = ("caps", "quit")
+
+# A desktop, or how to find it from the current one.
+type Target = Index1D | int | Callable[[Index1D], Index1D]
+
+
+def _parse_step(metadata: Any) -> Step | None:
+    """
+    Relative commands carry their step as metadata, e.g. "pan:+1".
+    """
+    if not isinstance(metadata, str) or ":" not in metadata:
+        return None
+    kind, _, delta = metadata.partition(":")
+    return Step(kind, int(delta))
+
+
+def _is_history(metadata: Any) -> bool:
+    step = _parse_step(metadata)
+    return step is not None and step.kind == "history"
+
 
 class PowerDesktopLayout(LayoutClass):
-    _model = Desktop1D()
-    _root: WindowRoot
+    _model: Desktop1D
+    _root_value: "WindowRoot | None" = None
+
+    @property
+    def _root(self) -> "WindowRoot":
+        """
+        The HUD loads react_tk and tkinter, so it's created by the warm-up
+        thread, or by whoever needs it first.
+        """
+        root = self._root_value
+        if root is None:
+            with self._root_lock:
+                if self._root_value is None:
+                    self._root_value = self._create_root()
+                    startup_profile.mark("hud ready")
+                root = self._root_value
+        return root
 
     @property
     def ctx(self):
         return self._root.ctx
 
-    def __post_init__(self):
+    def _create_root(self) -> "WindowRoot":
         from power_desktop.ui import root
 
-        self._buffer = UndoBuffer(
-            self._model.current.to_history_entry(), maxlen=100
-        )
+        return root.window_root
+
+    def _create_journal(self) -> HistoryJournal:
+        return HistoryJournal()
 
-        def keep_track_of_history():
-            self._buffer.push(self._model.current.to_history_entry())
+    def _remember(self, entry: VdHistoryEntry) -> None:
+        self._mru.visit(entry.id)
+        if self._buffer.push(entry):
+            self._journal.append(entry.id, entry.index)
 
-        self._root = root.window_root
-        scheduler = BackgroundScheduler()
-        scheduler.add_job(  # type: ignore
-            wrap_reinit_vda_managers(keep_track_of_history),
-            "interval",
-            seconds=1,
+    def _warm_up(self) -> None:
+        with span("warm_up"):
+            self._root
+            self._model.backend.warm_up()
+        startup_profile.mark("warmed up")
+
+    def __post_init__(self):
+        # Commands aren't safe to repeat, so only the failing backend call
+        # is retried after a COM error.
+        backend = RecoveringBackend(get_backend())
+        self._recovery = backend.recovery
+        self._model = Desktop1D(backend, columns=columns_from_env())
+        self._recovery.on_reinit(self._model.invalidate)
+        self._journal = self._create_journal()
+        # Picks up where the last run left off, minus desktops that are gone.
+        current = self._model.current.to_history_entry()
+        history = self._journal.replay(self._model, limit=100)
+        self._buffer = UndoBuffer(history[0] if history else current, 100)
+        self._mru = MruIndex()
+        for entry in history:
+            self._mru.visit(entry.id)
+            self._buffer.push(entry)
+        if history:
+            self._remember(current)
+        else:
+            self._journal.append(current.id, current.index)
+
+        def keep_track_of_history(desktop: DesktopId):
+            # Runs off the hotkey thread, so it's where the topology is kept
+            # fresh. The generation only changes if the desktops did.
+            self._model.refresh()
+            self._remember(self._model.current.to_history_entry())
+
+        self._root_lock = Lock()
+        self._warm_up_thread = Thread(
+            target=self._warm_up, name="warm-up", daemon=True
         )
-        scheduler.start()  # type: ignore
+        self._warm_up_thread.start()
+        self._pipeline = CommandPipeline()
+        self._tracker = HistoryTracker(
+            self._model.backend, keep_track_of_history
+        )
+        self._tracker.start()
+        self._inventory = WindowInventory(self._model.backend)
+        self._inventory.start()
+        self._metrics_server = serve_metrics_from_env()
 
-        def _announce_start(x: Any) -> None:
+        def _show_banner() -> None:
+            self._warm_up_thread.join()
             self._root(executed=ProgramStarted(self._model), hidden=False)
-            sleep(3)
-            self._root(hidden=True)
+            startup_profile.report()
+
+            @self.ctx.schedule(delay=3, name="hide")
+            def _():
+                self._root(hidden=True)
+
+        def _announce_start(x: Any) -> None:
+            # Hotkeys are live as soon as this returns; the banner waits for
+            # the HUD off this thread.
+            startup_profile.mark("hotkeys live")
+            Thread(target=_show_banner, name="banner", daemon=True).start()
 
         def _announce_stop(x: Any) -> None:
+            self._tracker.stop()
+            self._inventory.stop()
             self._root(executed=ProgramStopping(), hidden=False)
-            sleep(2)
-            self._root(hidden=True)
-            os._exit(0)
+            self._journal.close()
+            stop_logs()
+
+            # Just long enough for the farewell frame to paint.
+            @self.ctx.schedule(delay=0.25, name="exit")
+            def _():
+                os._exit(0)
 
         self._layout.on("enter", _announce_start)
         self._layout.on("exit", _announce_stop)
 
     def __intercept__(self, hk: HotkeyInterceptionEvent):
+        if hk.command.info.metadata in _INLINE:
+            hk.next()
+            return
+        # Only enqueue here; this runs on the thread delivering hotkeys. The
+        # command's handler still runs, through `hk.next`, on the worker.
+        name = str(hk.command)
+        with span("hotkey", command=name):
+            step = _parse_step(hk.command.info.metadata)
+            self._pipeline.submit(
+                name,
+                lambda: self._execute(hk, hk.next),
+                self._publish,
+                step=step,
+                run_merged=(
+                    (lambda delta: self._execute(hk, self._merged(hk, delta)))
+                    if step
+                    else None
+                ),
+            )
+        # keyweave requires the event to be handled before this returns.
+        hk.end()
+
+    def _merged(self, hk: HotkeyInterceptionEvent, delta: int):
+        """
+        Runs a burst of relative commands as one move of `delta` steps.
+        """
+        step = _parse_step(hk.command.info.metadata)
+        assert step
+
+        def run():
+            # The interception event stands in for the HotkeyEvent, as it
+            # does for DesktopActionFail.
+            event: Any = hk
+            match step.kind:
+                case "history":
+                    ev = self._walk_history(event, delta)
+                case "tilt":
+                    direction = "down" if delta > 0 else "up"
+                    ev = self._pan_to(
+                        event, lambda vd: vd.towards(direction, abs(delta))
+                    )
+                case _:
+                    ev = self._pan_to(
+                        event, lambda vd: vd.plus(delta, loop=True)
+                    )
+            ev.repeat = abs(delta)
+            return ev
+
+        return run
+
+    def _execute(
+        self, hk: HotkeyInterceptionEvent, run: Callable[[], Any]
+    ) -> DesktopAction | None:
         try:
-            ev = exec_reinit_vda_managers(hk.next)
-            if hk.command.info.metadata == "quit":
-                return
+            ev = run()
         except BaseException as e:
-            ev = DesktopActionFail(hk, e)
+            # Whatever failed may have been acting on desktops that are gone.
+            self._model.invalidate()
+            ev = DesktopActionFail(hk, e, com_health=self._recovery.health())
         else:
-            if (
-                hk.command.info.metadata != "history"
-                and isinstance(ev, DesktopActionOkay)
-                and ev.pan
-            ):
-                self._buffer.push(ev.pan.end.to_history_entry())
+            if isinstance(ev, DesktopActionOkay):
+                if ev.pan:
+                    if not _is_history(hk.command.info.metadata):
+                        self._remember(ev.pan.end.to_history_entry())
+                if target := ev.moved:
+                    ev.window_count = self._inventory.count(target.end.id)
+        self._tracker.poke()
+        return ev
+
+    def _publish(self, ev: DesktopAction | None) -> None:
         if ev:
-            self._root(executed=ev, hidden=False)
+            with span("hud.render"):
+                self._root(executed=ev, hidden=False)
 
-        @self.ctx.schedule(delay=1, name="hide")
-        def _():
-            self._root(hidden=True)
+        with span("hud.schedule_hide"):
+
+            @self.ctx.schedule(delay=1, name="hide")
+            def _():
+                with span("hud.hide"):
+                    self._root(hidden=True)
 
     @property
     def current_vd(self):
         return self._model.current
 
     @(key.capslock)
-    @command(description="disables capslock", emoji="🚫")
+    @command(description="disables capslock", emoji="🚫", metadata="caps")
     def no_caps(self, event: HotkeyEvent):
         """
         Disables capslock to use as a modifier key
         """
+        # Needs pywin32, so it's only imported on Windows, when pressed.
+        from power_desktop.tools.disable_caps import force_caps_off
+
         force_caps_off()
 
     # Desktop switching commands
     # =========================================
-    def _pan_to(self, event: HotkeyEvent, desktop: Index1D | int):
-        start_vd = self.current_vd
+    def _locate(self, desktop: Target) -> tuple[Index1D, Index1D]:
+        """
+        Re-reads the current desktop, in case it was switched outside
+        PowerDesktops, and finds `desktop` from there. Only commands that
+        act on desktops call this, so the rest don't depend on COM.
+        """
+        start_vd = self._model.sync_current()
+        if callable(desktop):
+            return start_vd, desktop(start_vd)
+        return start_vd, self._model.at(desktop)
+
+    def _pan_to(self, event: HotkeyEvent, desktop: Target):
         """
         Switches to the desktop at the given position (no looping)
         """
-        desktop = self._model.at(desktop)
-        target_vd = desktop.get_vd()
-        target_vd.go()
+        start_vd, desktop = self._locate(desktop)
+        self._model.pan_to(desktop)
         return DesktopActionOkay(event, pan=Pan(start_vd, desktop))
 
-    def _shove_to(self, event: HotkeyEvent, desktop: Index1D | int):
-        start_vd = self.current_vd
+    def _shove_to(self, event: HotkeyEvent, desktop: Target):
         """
         Moves the current window to the desktop at the given position, optionally modulo
         No desktop switching occurs
         """
-        desktop = self._model.at(desktop)
-        target_vd = desktop.get_vd()
-        infos, avs = get_related_windows(AppView.current())
-        for av in avs:
-            av.move(target_vd)
-        return DesktopActionOkay(event, shove=Shove(infos, start_vd, desktop))
-
-    def _drag_to(self, event: HotkeyEvent, desktop: Index1D | int):
-        start_vd = self.current_vd
-        desktop = self._model.at(desktop)
-        target_vd = desktop.get_vd()
-        infos, avs = get_related_windows(AppView.current())
-        for current in avs:
-            current.move(target_vd)
-        target_vd.go()
+        start_vd, desktop = self._locate(desktop)
+        report = self._model.shove_to(desktop)
+        self._inventory.record_moves(report, desktop.id)
+        return DesktopActionOkay(event, shove=Shove(report, start_vd, desktop))
+
+    def _drag_to(self, event: HotkeyEvent, desktop: Target):
+        start_vd, desktop = self._locate(desktop)
+        report = self._model.drag_to(desktop)
+        self._inventory.record_moves(report, desktop.id)
+        return DesktopActionOkay(
+            event,
+            pan=Pan(start_vd, desktop),
+            shove=Shove(report, start_vd, desktop),
+        )
+
+    def _run_plan(self, plan: BulkPlan) -> MoveReport:
+        report = move_batch(self._model.backend, plan.moves)
+        self._inventory.record_batch(report, plan.moves)
+        return report
+
+    def _gather(self, event: HotkeyEvent):
+        """
+        Moves every window of the focused app onto the current desktop.
+        """
+        current = self._model.sync_current()
+        backend = self._model.backend
+        plan = plan_gather(
+            backend, self._inventory, backend.focused_window(), current.id
+        )
+        report = self._run_plan(plan)
+        return DesktopActionOkay(
+            event, bulk=Bulk(plan.kind, report, current, current)
+        )
+
+    def _evacuate_to(self, event: HotkeyEvent, desktop: Target):
+        """
+        Moves every window on the current desktop to `desktop` and pans
+        after them.
+        """
+        start_vd, desktop = self._locate(desktop)
+        plan = plan_evacuate(self._inventory, start_vd.id, desktop.id)
+        report = self._run_plan(plan)
+        self._model.pan_to(desktop)
         return DesktopActionOkay(
             event,
             pan=Pan(start_vd, desktop),
-            shove=Shove(infos, start_vd, desktop),
+            bulk=Bulk(plan.kind, report, start_vd, desktop),
         )
 
+    def _swap_with(self, event: HotkeyEvent, desktop: Target):
+        """
+        Exchanges the windows of the current desktop and `desktop`.
+        No desktop switching occurs.
+        """
+        start_vd, desktop = self._locate(desktop)
+        plan = plan_swap(self._inventory, start_vd.id, desktop.id)
+        report = self._run_plan(plan)
+        return DesktopActionOkay(
+            event, bulk=Bulk(plan.kind, report, start_vd, desktop)
+        )
+
+    def _walk_history(self, event: HotkeyEvent, steps: int):
+        """
+        Undoes (negative) or redoes (positive) `steps` pans, going as far as
+        the history allows, and switches once to where that lands.
+        """
+        start_vd = self._model.sync_current()
+        entry = None
+        for _ in range(abs(steps)):
+            try:
+                entry = (
+                    self._buffer.undo() if steps < 0 else self._buffer.redo()
+                )
+            except IndexError:
+                if entry is None:
+                    raise
+                break
+        if entry is None:
+            return DesktopActionOkay(event, pan=Pan(start_vd, start_vd))
+        desktop = self._model.resolve(entry)
+        self._model.pan_to(desktop)
+        return DesktopActionOkay(event, pan=Pan(start_vd, desktop))
+
+    def _jump_to(self, event: HotkeyEvent, id: DesktopId | None):
+        start_vd = self.current_vd
+        desktop = self._model.find(id) if id else None
+        if desktop is None:
+            return DesktopActionOkay(event, pan=Pan(start_vd, start_vd))
+        self._model.pan_to(desktop)
+        return DesktopActionOkay(event, pan=Pan(start_vd, desktop))
+
+    def _jump_mru(self, event: HotkeyEvent):
+        current = self._model.sync_current()
+        present = current.geometry.topology.positions
+        return self._jump_to(event, self._mru.previous(current.id, present))
+
+    def _cycle_top(self, event: HotkeyEvent, k: int = 4):
+        current = self._model.sync_current()
+        present = current.geometry.topology.positions
+        return self._jump_to(event, self._mru.cycle(current.id, k, present))
+
+    def _undo_pan(self, event: HotkeyEvent):
+        return self._walk_history(event, -1)
+
+    def _redo_pan(self, event: HotkeyEvent):
+        return self._walk_history(event, 1)
+
     @key.q[key.capslock]
     @command(
         description="returns to the previous desktop before a pan action",
         emoji="👁️↩️",
-        metadata="history",
+        metadata="history:-1",
     )
     def undo_pan(self, event: HotkeyEvent):
-        entry = self._buffer.undo()
-        entry.go()
-        return DesktopActionOkay(event, pan=Pan(self.current_vd, entry.desktop))
+        return self._undo_pan(event)
+
+    @key.tab.down[key.capslock]
+    @command(
+        description="pans to the most recently used other desktop",
+        emoji="👁️🔁",
+    )
+    def jump_mru(self, event: HotkeyEvent):
+        return self._jump_mru(event)
+
+    @key.r.down[key.capslock]
+    @command(
+        description="cycles through the most used desktops",
+        emoji="👁️🔝",
+    )
+    def cycle_top(self, event: HotkeyEvent):
+        return self._cycle_top(event)
 
     @key.esc.down[key.capslock]
     @command(
@@ -176,28 +457,50 @@ class PowerDesktopLayout(LayoutClass):
         self.signal_stop()
         return DesktopActionOkay(event)
 
+    @key.t.down[key.capslock]
+    @command(description="writes recent tracing spans to disk", emoji="🧵")
+    def dump_trace(self, event: HotkeyEvent):
+        # Opens in chrome://tracing or https://ui.perfetto.dev
+        dump_chrome("trace.json")
+        dump_jsonl("trace.jsonl")
+        return DesktopActionOkay(event, note="🧵 Wrote trace.json")
+
+    @key.m.down[key.capslock]
+    @command(description="writes a snapshot of the metrics to disk", emoji="📊")
+    def metrics_snapshot(self, event: HotkeyEvent):
+        dump_metrics("metrics.prom")
+        return DesktopActionOkay(event, note="📊 Wrote metrics.prom")
+
     @key.e.down[key.capslock]
     @command(
         description="returns to a previous desktop after an undo pan action",
         emoji="👁️↪️",
-        metadata="history",
+        metadata="history:+1",
     )
     def redo_pan(self, event: HotkeyEvent):
-        entry = self._buffer.redo()
-        entry.go()
-        return DesktopActionOkay(event, pan=Pan(self.current_vd, entry.desktop))
+        return self._redo_pan(event)
 
     # Directional desktop switching
     # =========================================
     @key.a[key.capslock]
-    @command(description="pans left", emoji="👁️⬅️")
+    @command(description="pans left", emoji="👁️⬅️", metadata="pan:-1")
     def pan_left(self, event: HotkeyEvent):
-        return self._pan_to(event, self.current_vd.left)
+        return self._pan_to(event, lambda vd: vd.left)
 
     @key.d.down[key.capslock]
-    @command(description="pans right", emoji="👁️➡️")
+    @command(description="pans right", emoji="👁️➡️", metadata="pan:+1")
     def pan_right(self, event: HotkeyEvent):
-        return self._pan_to(event, self.current_vd.right)
+        return self._pan_to(event, lambda vd: vd.right)
+
+    @key.w.down[key.capslock]
+    @command(description="pans up", emoji="👁️⬆️", metadata="tilt:-1")
+    def pan_up(self, event: HotkeyEvent):
+        return self._pan_to(event, lambda vd: vd.up)
+
+    @key.s.down[key.capslock]
+    @command(description="pans down", emoji="👁️⬇️", metadata="tilt:+1")
+    def pan_down(self, event: HotkeyEvent):
+        return self._pan_to(event, lambda vd: vd.down)
 
     @key.a.down[key.capslock, key.mouse_2]
     @command(
@@ -205,7 +508,7 @@ class PowerDesktopLayout(LayoutClass):
         emoji="🫷📅",
     )
     def shove_left(self, event: HotkeyEvent):
-        return self._shove_to(event, self.current_vd.left)
+        return self._shove_to(event, lambda vd: vd.left)
 
     @key.d.down[key.capslock, key.mouse_2]
     @command(
@@ -213,7 +516,7 @@ class PowerDesktopLayout(LayoutClass):
         emoji="🫸📅",
     )
     def shove_right(self, event: HotkeyEvent):
-        return self._shove_to(event, self.current_vd.right)
+        return self._shove_to(event, lambda vd: vd.right)
 
     @key.d.down[key.capslock, key.mouse_1]
     @command(
@@ -221,7 +524,7 @@ class PowerDesktopLayout(LayoutClass):
         emoji="🫱📅",
     )
     def drag_right(self, event: HotkeyEvent):
-        return self._drag_to(event, self.current_vd.right)
+        return self._drag_to(event, lambda vd: vd.right)
 
     @key.a.down[key.capslock, key.mouse_1]
     @command(
@@ -229,7 +532,7 @@ class PowerDesktopLayout(LayoutClass):
         emoji="🫲📅",
     )
     def drag_left(self, event: HotkeyEvent):
-        return self._drag_to(event, self.current_vd.left)
+        return self._drag_to(event, lambda vd: vd.left)
 
     # Direct desktop switching
     # =========================================
@@ -421,3 +724,157 @@ class PowerDesktopLayout(LayoutClass):
     )
     def shove_to_9(self, event: HotkeyEvent):
         return self._shove_to(event, 9)
+
+    # Bulk window commands
+    # =========================================
+    @key.g.down[key.capslock]
+    @command(
+        description="moves every window of the current app to this desktop",
+        emoji="🧲",
+    )
+    def gather(self, event: HotkeyEvent):
+        return self._gather(event)
+
+    @key.d_1.down[key.capslock, key.x]
+    @command(
+        description="moves every window here to desktop 1 and pans to it",
+        emoji=f"📦🫱{get_number_emoji(1)}",
+    )
+    def evacuate_to_1(self, event: HotkeyEvent):
+        return self._evacuate_to(event, 1)
+
+    @key.d_2.down[key.capslock, key.x]
+    @command(
+        description="moves every window here to desktop 2 and pans to it",
+        emoji=f"📦🫱{get_number_emoji(2)}",
+    )
+    def evacuate_to_2(self, event: HotkeyEvent):
+        return self._evacuate_to(event, 2)
+
+    @key.d_3.down[key.capslock, key.x]
+    @command(
+        description="moves every window here to desktop 3 and pans to it",
+        emoji=f"📦🫱{get_number_emoji(3)}",
+    )
+    def evacuate_to_3(self, event: HotkeyEvent):
+        return self._evacuate_to(event, 3)
+
+    @key.d_4.down[key.capslock, key.x]
+    @command(
+        description="moves every window here to desktop 4 and pans to it",
+        emoji=f"📦🫱{get_number_emoji(4)}",
+    )
+    def evacuate_to_4(self, event: HotkeyEvent):
+        return self._evacuate_to(event, 4)
+
+    @key.d_5.down[key.capslock, key.x]
+    @command(
+        description="moves every window here to desktop 5 and pans to it",
+        emoji=f"📦🫱{get_number_emoji(5)}",
+    )
+    def evacuate_to_5(self, event: HotkeyEvent):
+        return self._evacuate_to(event, 5)
+
+    @key.d_6.down[key.capslock, key.x]
+    @command(
+        description="moves every window here to desktop 6 and pans to it",
+        emoji=f"📦🫱{get_number_emoji(6)}",
+    )
+    def evacuate_to_6(self, event: HotkeyEvent):
+        return self._evacuate_to(event, 6)
+
+    @key.d_7.down[key.capslock, key.x]
+    @command(
+        description="moves every window here to desktop 7 and pans to it",
+        emoji=f"📦🫱{get_number_emoji(7)}",
+    )
+    def evacuate_to_7(self, event: HotkeyEvent):
+        return self._evacuate_to(event, 7)
+
+    @key.d_8.down[key.capslock, key.x]
+    @command(
+        description="moves every window here to desktop 8 and pans to it",
+        emoji=f"📦🫱{get_number_emoji(8)}",
+    )
+    def evacuate_to_8(self, event: HotkeyEvent):
+        return self._evacuate_to(event, 8)
+
+    @key.d_9.down[key.capslock, key.x]
+    @command(
+        description="moves every window here to desktop 9 and pans to it",
+        emoji=f"📦🫱{get_number_emoji(9)}",
+    )
+    def evacuate_to_9(self, event: HotkeyEvent):
+        return self._evacuate_to(event, 9)
+
+    @key.d_1.down[key.capslock, key.z]
+    @command(
+        description="swaps the windows of this desktop and desktop 1",
+        emoji=f"🔀📅{get_number_emoji(1)}",
+    )
+    def swap_with_1(self, event: HotkeyEvent):
+        return self._swap_with(event, 1)
+
+    @key.d_2.down[key.capslock, key.z]
+    @command(
+        description="swaps the windows of this desktop and desktop 2",
+        emoji=f"🔀📅{get_number_emoji(2)}",
+    )
+    def swap_with_2(self, event: HotkeyEvent):
+        return self._swap_with(event, 2)
+
+    @key.d_3.down[key.capslock, key.z]
+    @command(
+        description="swaps the windows of this desktop and desktop 3",
+        emoji=f"🔀📅{get_number_emoji(3)}",
+    )
+    def swap_with_3(self, event: HotkeyEvent):
+        return self._swap_with(event, 3)
+
+    @key.d_4.down[key.capslock, key.z]
+    @command(
+        description="swaps the windows of this desktop and desktop 4",
+        emoji=f"🔀📅{get_number_emoji(4)}",
+    )
+    def swap_with_4(self, event: HotkeyEvent):
+        return self._swap_with(event, 4)
+
+    @key.d_5.down[key.capslock, key.z]
+    @command(
+        description="swaps the windows of this desktop and desktop 5",
+        emoji=f"🔀📅{get_number_emoji(5)}",
+    )
+    def swap_with_5(self, event: HotkeyEvent):
+        return self._swap_with(event, 5)
+
+    @key.d_6.down[key.capslock, key.z]
+    @command(
+        description="swaps the windows of this desktop and desktop 6",
+        emoji=f"🔀📅{get_number_emoji(6)}",
+    )
+    def swap_with_6(self, event: HotkeyEvent):
+        return self._swap_with(event, 6)
+
+    @key.d_7.down[key.capslock, key.z]
+    @command(
+        description="swaps the windows of this desktop and desktop 7",
+        emoji=f"🔀📅{get_number_emoji(7)}",
+    )
+    def swap_with_7(self, event: HotkeyEvent):
+        return self._swap_with(event, 7)
+
+    @key.d_8.down[key.capslock, key.z]
+    @command(
+        description="swaps the windows of this desktop and desktop 8",
+        emoji=f"🔀📅{get_number_emoji(8)}",
+    )
+    def swap_with_8(self, event: HotkeyEvent):
+        return self._swap_with(event, 8)
+
+    @key.d_9.down[key.capslock, key.z]
+    @command(
+        description="swaps the windows of this desktop and desktop 9",
+        emoji=f"🔀📅{get_number_emoji(9)}",
+    )
+    def swap_with_9(self, event: HotkeyEvent):
+        return self._swap_with(event, 9)
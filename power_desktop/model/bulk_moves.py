@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+
+from power_desktop.backend.base import DesktopBackend, DesktopId, WindowInfo
+from power_desktop.model.window_inventory import WindowInventory
+
+
+@dataclass(frozen=True)
+class BulkPlan:
+    """
+    Every window a bulk command will move, and where to.
+    """
+
+    kind: str
+    moves: tuple[tuple[WindowInfo, DesktopId], ...]
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+
+def _by_handle(hwnd: int) -> WindowInfo:
+    # The inventory only knows windows by handle; nothing that runs a bulk
+    # move needs their process or title.
+    return WindowInfo(hwnd, 0, "")
+
+
+def plan_gather(
+    backend: DesktopBackend,
+    inventory: WindowInventory,
+    window: WindowInfo,
+    desktop: DesktopId,
+) -> BulkPlan:
+    """
+    Every window of `window`'s process that's on another desktop.
+    """
+    return BulkPlan(
+        "gather",
+        tuple(
+            (w, desktop)
+            for w in backend.list_windows(window.pid)
+            if inventory.desktop_of(w.hwnd) not in (None, desktop)
+        ),
+    )
+
+
+def plan_evacuate(
+    inventory: WindowInventory, source: DesktopId, target: DesktopId
+) -> BulkPlan:
+    if source == target:
+        return BulkPlan("evacuate", ())
+    return BulkPlan(
+        "evacuate",
+        tuple(
+            (_by_handle(hwnd), target)
+            for hwnd in sorted(inventory.windows_on(source))
+        ),
+    )
+
+
+def plan_swap(
+    inventory: WindowInventory, a: DesktopId, b: DesktopId
+) -> BulkPlan:
+    return BulkPlan(
+        "swap",
+        plan_evacuate(inventory, a, b).moves
+        + plan_evacuate(inventory, b, a).moves,
+    )
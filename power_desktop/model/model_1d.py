@@ -1,18 +1,34 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from pyvda import (  # pyright: ignore[reportMissingTypeStubs]
-    AppView,
-    VirtualDesktop,
-    get_virtual_desktops,
+from power_desktop.backend.base import (
+    DesktopBackend,
+    DesktopId,
+    UnknownDesktopError,
 )
-
+from power_desktop.model.model_2d import (
+    Direction,
+    NeighbourTable,
+    neighbour_table,
+)
+from power_desktop.model.topology import DesktopTopology, TopologyCache
+from power_desktop.tools.batch_move import MoveReport, move_windows
+from power_desktop.tools.tracing import span
 from power_desktop.util.windows import get_related_windows
-from comtypes import GUID  # type: ignore
 
 
 @dataclass
 class VirtualDesktopGeometry1D:
-    total: int
+    topology: DesktopTopology
+    # Desktops per row of the grid; a single row if None.
+    columns: int | None = field(default=None)
+
+    @property
+    def total(self) -> int:
+        return self.topology.total
+
+    @property
+    def table(self) -> NeighbourTable:
+        return neighbour_table(self.total, self.columns or self.total)
 
     def __call__(self, index: int, loop: bool = False):
         return Index1D(self.loop(index) if loop else self.check(index), self)
@@ -23,36 +39,27 @@ class VirtualDesktopGeometry1D:
         return index
 
     def loop(self, index: int):
-        return ((index - 1) % self.total) + 1
+        return self.table.loop(index)
 
     def __iter__(self):
         for i in range(1, self.total + 1):
             yield Index1D(i, self)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class VdHistoryEntry:
-    id: GUID
-    index: "Index1D"
-    geometry: VirtualDesktopGeometry1D
-
-    def go(self):
-        self.to_index().go()
-
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, VdHistoryEntry):
-            return NotImplemented
-        return self.id == other.id
+    id: DesktopId
+    # Where the desktop was when recorded; only used if it no longer exists.
+    index: int = field(compare=False)
 
-    @property
-    def desktop(self):
-        return self.to_index()
-
-    def to_index(self) -> "Index1D":
-        for i in self.geometry:
-            if i.id == self.id:
-                return i
-        return self.index
+    def to_index(self, geometry: VirtualDesktopGeometry1D) -> "Index1D":
+        """
+        Finds the desktop this entry refers to in `geometry`.
+        """
+        position = geometry.topology.position_of(self.id)
+        if position is None:
+            return geometry(self.index, loop=True)
+        return geometry(position)
 
 
 @dataclass
@@ -61,18 +68,15 @@ class Index1D:
     geometry: VirtualDesktopGeometry1D
 
     def to_history_entry(self) -> VdHistoryEntry:
-        return VdHistoryEntry(self.id, self, self.geometry)
-
-    def go(self):
-        self.get_vd().go()
+        return VdHistoryEntry(self.id, self.index)
 
     @property
-    def id(self):
-        return self.get_vd().id
+    def id(self) -> DesktopId:
+        return self.geometry.topology.ids[self.index - 1]
 
     @property
     def name(self):
-        name = self.get_vd().number
+        name = self.geometry.topology.names[self.index - 1]
         return name if name else f"Desktop {self.index}"
 
     def __int__(self):
@@ -80,11 +84,26 @@ class Index1D:
 
     @property
     def right(self):
-        return self.plus(1, loop=True)
+        return self.towards("right")
 
     @property
     def left(self):
-        return self.minus(1, loop=True)
+        return self.towards("left")
+
+    @property
+    def up(self):
+        return self.towards("up")
+
+    @property
+    def down(self):
+        return self.towards("down")
+
+    def towards(self, direction: Direction, times: int = 1) -> "Index1D":
+        """
+        The desktop `times` steps away in the grid, wrapping around.
+        """
+        table = self.geometry.table
+        return Index1D(table.step(self.index, direction, times), self.geometry)
 
     def plus(self, other: "Index1D | int", loop: bool = False) -> "Index1D":
         return self._maybe_modulo(int(self) + int(other), loop)
@@ -98,52 +117,102 @@ class Index1D:
         result = self._maybe_modulo(int(self) - int(other), loop)
         return result
 
-    def get_vd(self) -> VirtualDesktop:
-        return VirtualDesktop(self.index)
-
 
 class Desktop1D:
+    """
+    Desktop model backed by a TopologyCache. Reads are served from the cached
+    topology; call `refresh()` or `invalidate()` when desktops change. It
+    invalidates itself when a desktop it knows of turns out to be gone.
+    """
+
+    def __init__(self, backend: DesktopBackend, columns: int | None = None):
+        self._backend = backend
+        self._topology = TopologyCache(backend)
+        self._columns = columns
 
     def __str__(self) -> str:
+        if self._columns:
+            return f"2D({self.total}, {self._columns} columns)"
         return f"1D({self.total})"
 
+    @property
+    def geometry(self) -> VirtualDesktopGeometry1D:
+        return VirtualDesktopGeometry1D(self._topology.snapshot, self._columns)
+
+    @property
+    def generation(self) -> int:
+        return self._topology.generation
+
+    def refresh(self) -> None:
+        self._topology.refresh()
+
+    def invalidate(self) -> None:
+        self._topology.invalidate()
+
+    def sync_current(self) -> Index1D:
+        """
+        Picks up desktop switches made outside PowerDesktops.
+        """
+        snapshot = self._topology.sync_current()
+        geometry = VirtualDesktopGeometry1D(snapshot, self._columns)
+        return geometry(snapshot.current)
+
     def at(self, index: int | Index1D) -> Index1D:
-        return Index1D(
-            int(index), VirtualDesktopGeometry1D(len(get_virtual_desktops()))
-        )
+        return self.geometry(int(index))
+
+    def resolve(self, entry: VdHistoryEntry) -> Index1D:
+        return entry.to_index(self.geometry)
+
+    def find(self, id: DesktopId) -> Index1D | None:
+        geometry = self.geometry
+        position = geometry.topology.position_of(id)
+        return geometry(position) if position is not None else None
 
     @property
     def total(self) -> int:
-        return len(get_virtual_desktops())
+        return self._topology.snapshot.total
 
     @property
     def current(self) -> Index1D:
-        return self.at(VirtualDesktop.current().number)
+        snapshot = self._topology.snapshot
+        geometry = VirtualDesktopGeometry1D(snapshot, self._columns)
+        return geometry(snapshot.current)
+
+    @property
+    def backend(self) -> DesktopBackend:
+        return self._backend
 
     def pan_to(self, desktop: Index1D, loop: bool = False) -> None:
         """
         Switches to the desktop at the given position (no looping)
         """
-        target_vd = desktop.get_vd()
-        target_vd.go()
-
-    def shove_to(self, desktop: Index1D, loop: bool = False) -> None:
+        with span("switch_to", desktop=desktop.index):
+            try:
+                self._backend.switch_to(desktop.id)
+            except UnknownDesktopError:
+                self.invalidate()
+                raise
+        self._topology.note_current(desktop.index)
+
+    def shove_to(self, desktop: Index1D, loop: bool = False) -> MoveReport:
         """
         Moves the current window to the desktop at the given position, optionally modulo
         No desktop switching occurs
         """
-        target_vd = desktop.get_vd()
-        _, avs = get_related_windows(AppView.current())
-        for av in avs:
-            av.move(target_vd)
+        windows = get_related_windows(
+            self._backend, self._backend.focused_window()
+        )
+        try:
+            return move_windows(self._backend, windows, desktop.id)
+        except UnknownDesktopError:
+            self.invalidate()
+            raise
 
-    def drag_to(self, desktop: Index1D, loop: bool = False) -> None:
+    def drag_to(self, desktop: Index1D, loop: bool = False) -> MoveReport:
         """
         Moves the current window to the desktop at the given position, optionally modulo
         Then switches to the target desktop
         """
-        target_vd = desktop.get_vd()
-        _, avs = get_related_windows(AppView.current())
-        for current in avs:
-            current.move(target_vd)
-        target_vd.go()
+        report = self.shove_to(desktop)
+        self.pan_to(desktop)
+        return report
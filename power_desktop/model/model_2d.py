@@ -0,0 +1,97 @@
+"""
+Desktops laid out as a grid, `columns` to a row, in their usual order: left
+to right, then top to bottom. A line of desktops is a grid with one row.
+
+Set POWER_DESKTOP_COLUMNS to arrange the desktops in a grid.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from logging import getLogger
+from typing import Literal
+
+logger = getLogger("power_desktop")
+
+type Direction = Literal["left", "right", "up", "down"]
+
+
+@dataclass(frozen=True)
+class NeighbourTable:
+    """
+    The desktop in each direction from every position, with wrap-around.
+
+    Positions are 1-based, so each tuple has an unused slot 0.
+
+    Left and right walk the desktops in order and wrap from the last to the
+    first, like a line does. Up and down stay in the column and wrap from
+    its top to its bottom; the last row may be shorter than the rest.
+
+    `wrap` maps any index from `1 - total` to `2 * total`, offset by
+    `total - 1`, to the position it loops around to.
+    """
+
+    total: int
+    columns: int
+    left: tuple[int, ...]
+    right: tuple[int, ...]
+    up: tuple[int, ...]
+    down: tuple[int, ...]
+    wrap: tuple[int, ...]
+
+    def loop(self, index: int) -> int:
+        offset = index + self.total - 1
+        if 0 <= offset < len(self.wrap):
+            return self.wrap[offset]
+        return (index - 1) % self.total + 1
+
+    def step(self, position: int, direction: Direction, times: int = 1) -> int:
+        table: tuple[int, ...] = getattr(self, direction)
+        for _ in range(times):
+            position = table[position]
+        return position
+
+
+@lru_cache(maxsize=8)
+def neighbour_table(total: int, columns: int) -> NeighbourTable:
+    """
+    Tables only depend on the shape of the grid, so they're built once for
+    each number of desktops rather than once per lookup.
+    """
+    columns = max(1, min(columns, total))
+    left, right, up, down = ([0] * (total + 1) for _ in range(4))
+    for column in range(columns):
+        cells = range(column + 1, total + 1, columns)
+        for i, position in enumerate(cells):
+            up[position] = cells[i - 1]
+            down[position] = cells[(i + 1) % len(cells)]
+    for position in range(1, total + 1):
+        left[position] = (position - 2) % total + 1
+        right[position] = position % total + 1
+    wrap = tuple((i - total) % total + 1 for i in range(3 * total))
+    return NeighbourTable(
+        total,
+        columns,
+        tuple(left),
+        tuple(right),
+        tuple(up),
+        tuple(down),
+        wrap,
+    )
+
+
+def columns_from_env() -> int | None:
+    """
+    The columns given by POWER_DESKTOP_COLUMNS, or None for a single row.
+    """
+    value = os.environ.get("POWER_DESKTOP_COLUMNS")
+    if not value:
+        return None
+    try:
+        columns = int(value)
+    except ValueError:
+        columns = 0
+    if columns < 1:
+        logger.warning(f"Ignoring POWER_DESKTOP_COLUMNS={value!r}")
+        return None
+    return columns
@@ -0,0 +1,109 @@
+from dataclasses import dataclass, field, replace
+from threading import RLock
+
+from power_desktop.backend.base import DesktopBackend, DesktopId
+from power_desktop.tools.tracing import span
+
+
+@dataclass(frozen=True)
+class DesktopTopology:
+    """
+    Immutable snapshot of the virtual desktop layout.
+
+    Positions are 1-based, like Index1D. The generation only changes when the
+    set or order of desktops changes, not when the current desktop does.
+    """
+
+    generation: int
+    ids: tuple[DesktopId, ...]
+    names: tuple[str, ...]
+    current: int
+    # Maps each id to its position. Shared between snapshots of the same
+    # generation, since it's only rebuilt when the ids change.
+    positions: dict[DesktopId, int] = field(compare=False, repr=False)
+
+    @property
+    def total(self) -> int:
+        return len(self.ids)
+
+    def position_of(self, id: DesktopId) -> int | None:
+        return self.positions.get(id)
+
+
+class TopologyCache:
+    """
+    Holds the latest DesktopTopology so that lookups are served from memory.
+
+    The desktops are only enumerated again after `invalidate()` (a change
+    signal) or an explicit `refresh()`.
+    """
+
+    def __init__(self, backend: DesktopBackend):
+        self._backend = backend
+        self._lock = RLock()
+        self._snapshot: DesktopTopology | None = None
+        self._stale = True
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def snapshot(self) -> DesktopTopology:
+        snapshot = self._snapshot
+        if self._stale or snapshot is None:
+            return self.refresh()
+        return snapshot
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def refresh(self) -> DesktopTopology:
+        with self._lock, span("topology.refresh"):
+            # Cleared first, so an invalidate() during the listing sticks.
+            self._stale = False
+            try:
+                desktops = self._backend.list_desktops()
+                current_id = self._backend.current_desktop()
+            except BaseException:
+                self._stale = True
+                raise
+            ids = tuple(d.id for d in desktops)
+            names = tuple(d.name for d in desktops)
+            old = self._snapshot
+            if old is not None and old.ids == ids:
+                positions = old.positions
+            else:
+                positions = {id: i for i, id in enumerate(ids, 1)}
+            if old is None or old.ids != ids or old.names != names:
+                self._generation += 1
+            current = positions.get(current_id)
+            self._snapshot = DesktopTopology(
+                generation=self._generation,
+                ids=ids,
+                names=names,
+                current=current or 1,
+                positions=positions,
+            )
+            return self._snapshot
+
+    def sync_current(self) -> DesktopTopology:
+        """
+        Re-reads only the current desktop. Falls back to a full refresh if
+        the current desktop isn't part of the cached topology.
+        """
+        with span("topology.sync_current"):
+            snapshot = self.snapshot
+            current = snapshot.position_of(self._backend.current_desktop())
+            if current is None:
+                return self.refresh()
+            return self.note_current(current)
+
+    def note_current(self, current: int) -> DesktopTopology:
+        with self._lock:
+            snapshot = self.snapshot
+            if snapshot.current != current:
+                snapshot = replace(snapshot, current=current)
+                self._snapshot = snapshot
+            return snapshot
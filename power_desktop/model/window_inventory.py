@@ -0,0 +1,116 @@
+from collections import defaultdict
+from logging import getLogger
+from threading import Event, Lock, Thread
+from typing import Callable, Iterable
+
+from power_desktop.backend.base import DesktopBackend, DesktopId, WindowInfo
+from power_desktop.tools.batch_move import MoveReport
+from power_desktop.tools.tracing import span
+
+logger = getLogger("power_desktop")
+
+
+class WindowInventory:
+    """
+    Which windows are on which desktop, kept in memory so that commands and
+    the HUD can ask without scanning windows through COM.
+
+    It's updated from the moves PowerDesktops makes and from window
+    notifications. Windows doesn't report moves made by other programs, so
+    a full scan reconciles it every `reconcile_interval` seconds.
+    """
+
+    def __init__(
+        self, backend: DesktopBackend, reconcile_interval: float = 30.0
+    ):
+        self._backend = backend
+        self._interval = reconcile_interval
+        self._lock = Lock()
+        self._desktop_of: dict[int, DesktopId] = {}
+        self._windows: defaultdict[DesktopId, set[int]] = defaultdict(set)
+        # Updates made while a scan runs, replayed over its result.
+        self._during_scan: list[tuple[int, DesktopId | None]] | None = None
+        self._stopped = Event()
+        self._unsubscribe: Callable[[], None] | None = None
+
+    def start(self) -> None:
+        self._unsubscribe = self._backend.subscribe_window_changes(self._place)
+        Thread(
+            target=self._reconcile_loop, name="inventory", daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._unsubscribe:
+            self._unsubscribe()
+
+    def _place(self, hwnd: int, desktop: DesktopId | None) -> None:
+        with self._lock:
+            if self._during_scan is not None:
+                self._during_scan.append((hwnd, desktop))
+            self._place_locked(hwnd, desktop)
+
+    def _place_locked(self, hwnd: int, desktop: DesktopId | None) -> None:
+        old = self._desktop_of.pop(hwnd, None)
+        if old is not None:
+            self._windows[old].discard(hwnd)
+        if desktop is not None:
+            self._desktop_of[hwnd] = desktop
+            self._windows[desktop].add(hwnd)
+
+    def record_moves(self, report: MoveReport, desktop: DesktopId) -> None:
+        for window in report.moved:
+            self._place(window.hwnd, desktop)
+
+    def record_batch(
+        self,
+        report: MoveReport,
+        moves: Iterable[tuple[WindowInfo, DesktopId]],
+    ) -> None:
+        moved = {window.hwnd for window in report.moved}
+        for window, desktop in moves:
+            if window.hwnd in moved:
+                self._place(window.hwnd, desktop)
+
+    def reconcile(self) -> None:
+        with span("inventory.reconcile"):
+            with self._lock:
+                self._during_scan = []
+            try:
+                desktops = self._backend.window_desktops()
+            except BaseException:
+                with self._lock:
+                    self._during_scan = None
+                raise
+            windows: defaultdict[DesktopId, set[int]] = defaultdict(set)
+            for hwnd, desktop in desktops.items():
+                windows[desktop].add(hwnd)
+            with self._lock:
+                updates, self._during_scan = self._during_scan, None
+                self._desktop_of = desktops
+                self._windows = windows
+                # The scan may have seen the windows before these changes.
+                for hwnd, desktop in updates:
+                    self._place_locked(hwnd, desktop)
+
+    def _reconcile_loop(self) -> None:
+        while True:
+            try:
+                self.reconcile()
+            except Exception:
+                logger.exception("Failed to reconcile window inventory")
+            if self._stopped.wait(self._interval):
+                return
+
+    def desktop_of(self, hwnd: int) -> DesktopId | None:
+        with self._lock:
+            return self._desktop_of.get(hwnd)
+
+    def windows_on(self, desktop: DesktopId) -> frozenset[int]:
+        with self._lock:
+            return frozenset(self._windows.get(desktop, ()))
+
+    def count(self, desktop: DesktopId) -> int:
+        with self._lock:
+            windows = self._windows.get(desktop)
+            return len(windows) if windows else 0
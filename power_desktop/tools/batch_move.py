@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Sequence
+
+from power_desktop.backend.base import (
+    DesktopBackend,
+    DesktopId,
+    UnknownDesktopError,
+    WindowInfo,
+)
+from power_desktop.tools.metrics import COUNT_BOUNDS, registry
+from power_desktop.tools.tracing import span
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = Lock()
+
+_moved = registry.histogram(
+    "windows_moved", "Windows moved by each command.", COUNT_BOUNDS
+)
+_move_failures = registry.counter(
+    "window_move_failures_total", "Windows that couldn't be moved."
+)
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="move")
+        return _pool
+
+
+@dataclass(frozen=True)
+class MoveReport:
+    moved: tuple[WindowInfo, ...] = field(default=())
+    failed: tuple[tuple[WindowInfo, Exception], ...] = field(default=())
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def move_windows(
+    backend: DesktopBackend,
+    windows: tuple[WindowInfo, ...],
+    desktop: DesktopId,
+) -> MoveReport:
+    """
+    Moves all the windows to `desktop`, continuing past failures.
+    """
+    return move_batch(backend, tuple((w, desktop) for w in windows))
+
+
+def move_batch(
+    backend: DesktopBackend,
+    moves: Sequence[tuple[WindowInfo, DesktopId]],
+) -> MoveReport:
+    """
+    Moves each window to its own desktop, continuing past failures.
+
+    The moves are issued together when the backend allows it. If every move
+    failed with a transient error, or because the desktop is gone, the error
+    is raised so the caller can recover or refresh the desktops.
+    """
+
+    def move(planned: tuple[WindowInfo, DesktopId]) -> Exception | None:
+        window, desktop = planned
+        try:
+            with span("move_window", hwnd=window.hwnd):
+                backend.move_window(window.hwnd, desktop)
+        except Exception as e:
+            return e
+        return None
+
+    windows = [window for window, _ in moves]
+    if backend.concurrent_moves and len(moves) > 1:
+        errors = list(_get_pool().map(move, moves))
+    else:
+        errors = [move(planned) for planned in moves]
+    report = MoveReport(
+        moved=tuple(w for w, e in zip(windows, errors) if e is None),
+        failed=tuple((w, e) for w, e in zip(windows, errors) if e is not None),
+    )
+    _moved.observe(len(report.moved))
+    _move_failures.inc(len(report.failed))
+    if report.failed and not report.moved:
+        error = report.failed[0][1]
+        if isinstance(error, (UnknownDesktopError, *backend.transient_errors)):
+            raise error
+    return report
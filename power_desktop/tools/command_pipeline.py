@@ -0,0 +1,225 @@
+import asyncio
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from logging import getLogger
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable
+
+from power_desktop.tools.metrics import registry
+from power_desktop.tools.tracing import add_span, span
+from power_desktop.util.event_loop import create_event_loop
+
+logger = getLogger("power_desktop")
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    A relative move that can be merged with neighbouring moves of the same
+    kind and direction, e.g. two "pan" steps of +1 become one of +2.
+    """
+
+    kind: str
+    delta: int
+
+
+@dataclass
+class _Job:
+    name: str
+    run: Callable[[], Any]
+    publish: Callable[[Any], None] | None
+    step: Step | None = field(default=None)
+    # Runs a burst of merged steps, given their total delta.
+    run_merged: Callable[[int], Any] | None = field(default=None)
+    recorded: bool = field(default=True)
+    future: Future[Any] = field(default_factory=lambda: Future[Any]())
+    enqueued: float = field(default_factory=perf_counter)
+
+    def merges_with(self, other: "_Job") -> bool:
+        return (
+            self.step is not None
+            and other.step is not None
+            and other.run_merged is not None
+            and self.step.kind == other.step.kind
+            # Otherwise -1 then +1 would merge into a move of 0.
+            and (self.step.delta > 0) == (other.step.delta > 0)
+        )
+
+
+class CommandPipeline:
+    """
+    Runs commands one at a time, in the order they were submitted, on a
+    worker owned by a dedicated event loop.
+
+    Submitting only enqueues, so the thread delivering hotkeys is never
+    held up by the command itself.
+
+    Commands submitted with a Step are coalesced: once one reaches the front
+    of the queue, steps of the same kind and direction already queued behind
+    it run with it as a single command. A step that arrives within
+    `coalesce_window` seconds of the last one finishing is part of a burst,
+    so it also waits that long for more; a lone step runs right away.
+    """
+
+    def __init__(
+        self,
+        name: str = "commands",
+        coalesce_window: float = 0.06,
+        slow_threshold: float = 0.25,
+    ):
+        self._loop = create_event_loop(name)
+        self._pending: deque[_Job] = deque()
+        self._wake: asyncio.Event | None = None
+        self._lock = Lock()
+        self._depth = 0
+        self._depth_gauge = registry.gauge(
+            "command_queue_depth", "Commands queued or running.", pipeline=name
+        )
+        self.coalesce_window = coalesce_window
+        self._last_step_done = float("-inf")
+        self._slow_threshold = slow_threshold
+        ready: Future[None] = Future()
+        self._loop.call_soon_threadsafe(self._start, ready)
+        ready.result()
+
+    def _start(self, ready: Future[None]) -> None:
+        self._wake = asyncio.Event()
+        self._loop.create_task(self._consume())
+        ready.set_result(None)
+
+    def submit[R](
+        self,
+        name: str,
+        run: Callable[[], R],
+        publish: Callable[[R], None] | None = None,
+        step: Step | None = None,
+        run_merged: Callable[[int], R] | None = None,
+    ) -> Future[R]:
+        return self._enqueue(_Job(name, run, publish, step, run_merged))
+
+    def _enqueue(self, job: _Job) -> Future[Any]:
+        with self._lock:
+            self._depth += 1
+            self._depth_gauge.set(self._depth)
+        self._loop.call_soon_threadsafe(self._push, job)
+        return job.future
+
+    def _push(self, job: _Job) -> None:
+        assert self._wake
+        self._pending.append(job)
+        self._wake.set()
+
+    def _settle(self, jobs: list[_Job]) -> int:
+        """
+        Takes finished jobs off the depth before their futures resolve, so a
+        caller woken by one doesn't see them as still queued. Returns what's
+        left.
+        """
+        with self._lock:
+            self._depth -= len(jobs)
+            self._depth_gauge.set(self._depth)
+            return self._depth
+
+    def join(self, timeout: float | None = None) -> None:
+        """
+        Waits until everything submitted so far has run.
+        """
+        barrier = _Job("join", lambda: None, None, recorded=False)
+        self._enqueue(barrier).result(timeout)
+
+    async def _consume(self) -> None:
+        assert self._wake
+        while True:
+            while not self._pending:
+                self._wake.clear()
+                await self._wake.wait()
+            jobs = [self._pending.popleft()]
+            first = jobs[0]
+            if first.step and first.run_merged:
+                since_last = perf_counter() - self._last_step_done
+                if since_last < self.coalesce_window:
+                    await asyncio.sleep(self.coalesce_window)
+                while self._pending and first.merges_with(self._pending[0]):
+                    jobs.append(self._pending.popleft())
+            try:
+                await self._loop.run_in_executor(None, self._execute, jobs)
+            finally:
+                if first.step:
+                    self._last_step_done = perf_counter()
+
+    def _execute(self, jobs: list[_Job]) -> None:
+        first, job = jobs[0], jobs[-1]
+        started = perf_counter()
+        if job.recorded:
+            add_span(
+                "queued",
+                int(first.enqueued * 1e9),
+                int(started * 1e9),
+                overlapping=True,
+                command=job.name,
+            )
+        try:
+            traced = (
+                span("command", command=job.name, merged=len(jobs))
+                if job.recorded
+                else nullcontext()
+            )
+            with traced:
+                if len(jobs) == 1:
+                    result = job.run()
+                else:
+                    assert job.run_merged
+                    delta = sum(x.step.delta for x in jobs if x.step)
+                    result = job.run_merged(delta)
+        except BaseException as e:
+            self._settle(jobs)
+            for x in jobs:
+                x.future.set_exception(e)
+            return
+        ran = perf_counter()
+        try:
+            if job.publish:
+                with span("publish", command=job.name):
+                    job.publish(result)
+        except Exception:
+            logger.exception(f"Failed to publish result of {job.name}")
+        done = perf_counter()
+        depth = self._settle(jobs)
+        for x in jobs:
+            x.future.set_result(result)
+        if not job.recorded:
+            return
+        queued, run, publish = (
+            started - first.enqueued,
+            ran - started,
+            done - ran,
+        )
+        registry.histogram(
+            "command_queued_seconds",
+            "Time a command waited in the queue.",
+            command=job.name,
+        ).observe(queued)
+        registry.histogram(
+            "command_run_seconds",
+            "Time a command took to execute.",
+            command=job.name,
+        ).observe(run)
+        registry.histogram(
+            "command_publish_seconds",
+            "Time a command took to publish its result.",
+            command=job.name,
+        ).observe(publish)
+        registry.histogram(
+            "command_seconds",
+            "Time from hotkey to published result, per command.",
+            command=job.name,
+        ).observe(done - first.enqueued)
+        if done - first.enqueued > self._slow_threshold:
+            logger.warning(
+                f"Slow command {job.name}: queued {queued:.3f}s, "
+                f"ran {run:.3f}s, published {publish:.3f}s, "
+                f"{depth} more queued"
+            )
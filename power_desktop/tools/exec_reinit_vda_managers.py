@@ -1,28 +1,268 @@
-import _ctypes
+from dataclasses import dataclass
+from enum import Enum
 from logging import getLogger
+from threading import Lock
+from time import monotonic, sleep
 from typing import Callable
 
+from power_desktop.backend.base import (
+    DesktopBackend,
+    DesktopId,
+    DesktopInfo,
+    WindowInfo,
+)
+from power_desktop.tools.metrics import registry
+from power_desktop.tools.tracing import span
+
 logger = getLogger("power_desktop")
 
+_recoveries = registry.counter(
+    "com_recoveries_total", "Transient COM errors recovered from."
+)
+_recovery_failures = registry.counter(
+    "com_recovery_failures_total", "Transient COM errors that persisted."
+)
+_breaker_trips = registry.counter(
+    "com_breaker_trips_total", "Times the COM circuit breaker opened."
+)
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+@dataclass(frozen=True)
+class ComHealth:
+    state: BreakerState
+    # Consecutive calls that failed even after recovering.
+    failures: int
+    # Seconds until an open breaker lets a call through again.
+    retry_in: float
+
+    def __str__(self) -> str:
+        match self.state:
+            case BreakerState.OPEN:
+                return (
+                    "🔌 Desktop service down, "
+                    f"retrying in {self.retry_in:.0f}s"
+                )
+            case BreakerState.HALF_OPEN:
+                return "🔌 Desktop service recovering"
+            case BreakerState.CLOSED:
+                return "🔌 Desktop service OK"
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, health: ComHealth):
+        super().__init__(str(health))
+        self.health = health
 
-def exec_reinit_vda_managers[R](func: Callable[[], R]) -> R:
-    try:
-        return func()
-    except _ctypes.COMError as e:
+
+class ComRecovery:
+    """
+    Runs calls to `backend`, recovering from its transient (COM) errors.
+
+    - Only one thread reinitializes at a time. Threads that failed while
+      another was reinitializing wait for it and then just retry.
+    - A failing call is retried up to `max_attempts` times, with exponential
+      backoff between reinits, so keep what's run here safe to repeat.
+    - After `failure_threshold` calls in a row fail anyway, the breaker opens
+      and calls fail fast with CircuitOpenError for `cooldown` seconds. Then
+      one call is let through; if it works the breaker closes again.
+    """
+
+    def __init__(
+        self,
+        backend: DesktopBackend,
+        max_attempts: int = 3,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        failure_threshold: int = 3,
+        cooldown: float = 10.0,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self._backend = backend
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown
+        self._clock = clock
+        self._reinit_lock = Lock()
+        self._state_lock = Lock()
+        # Counts completed reinits.
+        self._generation = 0
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        # Whether a half-open probe is in flight.
+        self._probing = False
+        self._on_reinit: list[Callable[[], None]] = []
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def on_reinit(self, callback: Callable[[], None]) -> None:
+        """
+        Calls `callback` after every reinit, to drop state read before it.
+        """
+        self._on_reinit.append(callback)
+
+    def health(self) -> ComHealth:
+        retry_in = 0.0
+        if self._state is BreakerState.OPEN:
+            elapsed = self._clock() - self._opened_at
+            retry_in = max(self._cooldown - elapsed, 0.0)
+        return ComHealth(self._state, self._failures, retry_in)
+
+    def _set_state(self, state: BreakerState) -> None:
+        if state is self._state:
+            return
         logger.warning(
-            f"Caught COMError, trying to recover by reinitializing VDA managers. {e}"
+            f"COM circuit breaker {self._state.value} -> {state.value}"
         )
-        import pyvda.pyvda  # pyright: ignore[reportMissingTypeStubs]
+        self._state = state
+
+    def _admit(self) -> bool:
+        """
+        Raises if the breaker is open. Returns whether this call is a
+        half-open probe, which only gets one reinit.
+        """
+        with self._state_lock:
+            if self._state is BreakerState.CLOSED:
+                return False
+            if self._state is BreakerState.OPEN:
+                if self._clock() - self._opened_at < self._cooldown:
+                    raise CircuitOpenError(self.health())
+                self._set_state(BreakerState.HALF_OPEN)
+            elif self._probing:
+                raise CircuitOpenError(self.health())
+            self._probing = True
+            return True
+
+    def _succeeded(self) -> None:
+        if self._state is BreakerState.CLOSED and not self._failures:
+            return
+        with self._state_lock:
+            self._failures = 0
+            self._set_state(BreakerState.CLOSED)
+
+    def _failed(self) -> None:
+        with self._state_lock:
+            self._failures += 1
+            if (
+                self._state is BreakerState.HALF_OPEN
+                or self._failures >= self._failure_threshold
+            ):
+                if self._state is not BreakerState.OPEN:
+                    _breaker_trips.inc()
+                self._opened_at = self._clock()
+                self._set_state(BreakerState.OPEN)
+
+    def _reinit(self, seen: int) -> None:
+        """
+        Reinitializes the backend, unless someone else did since `seen`.
+        """
+        with self._reinit_lock:
+            if self._generation != seen:
+                return
+            with span("exec_reinit_vda_managers"):
+                self._backend.recover()
+            self._generation += 1
+            logger.info("Reinitialized VDA managers")
+        for callback in self._on_reinit:
+            callback()
+
+    def run[R](self, func: Callable[[], R]) -> R:
+        probe = self._admit()
+        try:
+            return self._attempt(func, probe)
+        finally:
+            if probe:
+                with self._state_lock:
+                    self._probing = False
+
+    def _attempt[R](self, func: Callable[[], R], probe: bool) -> R:
+        backend = self._backend
+        attempts = min(2, self._max_attempts) if probe else self._max_attempts
+        for attempt in range(1, attempts + 1):
+            seen = self._generation
+            try:
+                result = func()
+            except backend.transient_errors as e:
+                if attempt == attempts:
+                    _recovery_failures.inc()
+                    self._failed()
+                    raise
+                logger.warning(
+                    f"Caught COMError (attempt {attempt}/{attempts}), "
+                    f"reinitializing VDA managers. {e}"
+                )
+                if attempt > 1:
+                    delay = self._base_delay * 2 ** (attempt - 2)
+                    sleep(min(delay, self._max_delay))
+                try:
+                    self._reinit(seen)
+                except backend.transient_errors as e:
+                    logger.warning(f"Reinitializing failed: {e}")
+                continue
+            if attempt > 1:
+                _recoveries.inc()
+                logger.info("Recovered from COMError.")
+            self._succeeded()
+            return result
+        raise AssertionError("unreachable")
+
+
+class RecoveringBackend:
+    """
+    Runs each call to the wrapped backend through its own ComRecovery, so a
+    transient error retries only the call that failed and not the whole
+    command around it.
+    """
+
+    def __init__(self, inner: DesktopBackend):
+        self._inner = inner
+        self.recovery = ComRecovery(inner)
+        self.transient_errors = inner.transient_errors
+        self.concurrent_moves = inner.concurrent_moves
+
+    def list_desktops(self) -> tuple[DesktopInfo, ...]:
+        return self.recovery.run(self._inner.list_desktops)
+
+    def current_desktop(self) -> DesktopId:
+        return self.recovery.run(self._inner.current_desktop)
+
+    def switch_to(self, desktop: DesktopId) -> None:
+        self.recovery.run(lambda: self._inner.switch_to(desktop))
+
+    def focused_window(self) -> WindowInfo:
+        return self.recovery.run(self._inner.focused_window)
+
+    def list_windows(self, pid: int | None = None) -> tuple[WindowInfo, ...]:
+        return self.recovery.run(lambda: self._inner.list_windows(pid))
+
+    def move_window(self, hwnd: int, desktop: DesktopId) -> None:
+        self.recovery.run(lambda: self._inner.move_window(hwnd, desktop))
+
+    def subscribe_desktop_changes(
+        self, callback: Callable[[DesktopId], None]
+    ) -> Callable[[], None] | None:
+        return self._inner.subscribe_desktop_changes(callback)
 
-        pyvda.pyvda.managers.__init__()  # type: ignore
-        logger.info("Reinitialized VDA managers")
-        x = func()
-        logger.info("Recovered from COMError.")
-        return x
+    def window_desktops(self) -> dict[int, DesktopId]:
+        return self.recovery.run(self._inner.window_desktops)
 
+    def subscribe_window_changes(
+        self, callback: Callable[[int, DesktopId | None], None]
+    ) -> Callable[[], None] | None:
+        return self._inner.subscribe_window_changes(callback)
 
-def wrap_reinit_vda_managers[R](func: Callable[[], R]) -> Callable[[], R]:
-    def wrapped() -> R:
-        return exec_reinit_vda_managers(func)
+    def warm_up(self) -> None:
+        self.recovery.run(self._inner.warm_up)
 
-    return wrapped
+    def recover(self) -> None:
+        self._inner.recover()
@@ -0,0 +1,153 @@
+import os
+import struct
+from dataclasses import dataclass
+from logging import getLogger
+from queue import SimpleQueue
+from threading import Lock, Thread
+from time import time_ns
+from typing import BinaryIO
+from uuid import UUID
+
+from power_desktop.backend.base import DesktopId
+from power_desktop.model.model_1d import Desktop1D, VdHistoryEntry
+
+logger = getLogger("power_desktop")
+
+_MAGIC = b"PDHJ\x01\x00\x00\x00"
+# Desktop GUID, its 1-based position, and when it became current.
+_RECORD = struct.Struct("<16sIq")
+
+
+@dataclass(frozen=True)
+class JournalRecord:
+    id: DesktopId
+    index: int
+    timestamp_ns: int
+
+
+class HistoryJournal:
+    """
+    An append-only binary log of desktop switches, so the undo history
+    survives restarts.
+
+    `append()` only enqueues; a background thread does the writing. Once the
+    file passes `max_bytes`, it's rewritten with just the newest `keep`
+    records.
+    """
+
+    def __init__(
+        self,
+        path: str = "history.bin",
+        max_bytes: int = 1 << 20,
+        keep: int = 1000,
+    ):
+        self._path = path
+        self._max_bytes = max_bytes
+        self._keep = keep
+        self._queue: SimpleQueue[bytes | None] = SimpleQueue()
+        self._writer: Thread | None = None
+        self._writer_lock = Lock()
+
+    def read(self) -> list[JournalRecord]:
+        try:
+            with open(self._path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return []
+        if len(data) <= len(_MAGIC):
+            return []
+        if data[: len(_MAGIC)] != _MAGIC:
+            logger.warning(f"Ignoring {self._path}, it isn't a journal")
+            return []
+        # A crash can leave half a record at the end.
+        end = len(data) - (len(data) - len(_MAGIC)) % _RECORD.size
+        return [
+            JournalRecord(UUID(bytes=guid), index, timestamp)
+            for guid, index, timestamp in _RECORD.iter_unpack(
+                data[len(_MAGIC) : end]
+            )
+        ]
+
+    def replay(self, model: Desktop1D, limit: int) -> list[VdHistoryEntry]:
+        """
+        The newest `limit` journaled desktops that still exist, oldest
+        first.
+        """
+        topology = model.geometry.topology
+        entries: list[VdHistoryEntry] = []
+        for record in self.read()[-limit:]:
+            position = topology.position_of(record.id)
+            if position is not None:
+                entries.append(VdHistoryEntry(record.id, position))
+        return entries
+
+    def append(self, id: DesktopId, index: int) -> None:
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    writer = Thread(
+                        target=self._write, name="history-journal", daemon=True
+                    )
+                    writer.start()
+                    self._writer = writer
+        self._queue.put(_RECORD.pack(id.bytes, index, time_ns()))
+
+    def close(self, timeout: float = 1.0) -> None:
+        """
+        Waits for pending records to be written.
+        """
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join(timeout)
+
+    def _write(self) -> None:
+        try:
+            f = self._open()
+        except OSError:
+            logger.exception(f"Failed to open {self._path}")
+            return
+        try:
+            while (record := self._queue.get()) is not None:
+                batch = [record]
+                while not self._queue.empty():
+                    record = self._queue.get()
+                    if record is None:
+                        break
+                    batch.append(record)
+                f.write(b"".join(batch))
+                f.flush()
+                if f.tell() > self._max_bytes:
+                    f.close()
+                    self._compact()
+                    f = self._open()
+                if record is None:
+                    return
+        except OSError:
+            logger.exception(f"Failed to write {self._path}")
+        finally:
+            f.close()
+
+    def _open(self) -> BinaryIO:
+        f = open(self._path, "r+b" if os.path.exists(self._path) else "w+b")
+        header = f.read(len(_MAGIC))
+        size = f.seek(0, os.SEEK_END)
+        if header != _MAGIC:
+            f.seek(0)
+            f.truncate()
+            f.write(_MAGIC)
+        else:
+            # Drop half a record left by a crash, so new ones line up.
+            f.truncate(size - (size - len(_MAGIC)) % _RECORD.size)
+            f.seek(0, os.SEEK_END)
+        return f
+
+    def _compact(self) -> None:
+        records = self.read()[-self._keep :]
+        temp = f"{self._path}.tmp"
+        with open(temp, "wb") as f:
+            f.write(_MAGIC)
+            for r in records:
+                f.write(_RECORD.pack(r.id.bytes, r.index, r.timestamp_ns))
+        os.replace(temp, self._path)
+        logger.info(f"Compacted {self._path} to {len(records)} records")
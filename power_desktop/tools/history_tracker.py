@@ -0,0 +1,90 @@
+from logging import getLogger
+from threading import Event, Thread
+from typing import Callable
+
+from power_desktop.backend.base import DesktopBackend, DesktopId
+from power_desktop.tools.exec_reinit_vda_managers import CircuitOpenError
+
+logger = getLogger("power_desktop")
+
+
+class HistoryTracker:
+    """
+    Reports every desktop switch, including ones made without PowerDesktops.
+
+    Uses the backend's change notifications when it has them. Otherwise it
+    polls the current desktop, backing off from `min_interval` to
+    `max_interval` while the desktop stays the same.
+    """
+
+    def __init__(
+        self,
+        backend: DesktopBackend,
+        on_change: Callable[[DesktopId], None],
+        min_interval: float = 0.1,
+        max_interval: float = 2.0,
+        backoff: float = 1.5,
+    ):
+        self._backend = backend
+        self._on_change = on_change
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._stopped = Event()
+        self._woken = Event()
+        self._unsubscribe: Callable[[], None] | None = None
+
+    @property
+    def polling(self) -> bool:
+        return self._unsubscribe is None
+
+    def start(self) -> None:
+        self._unsubscribe = self._backend.subscribe_desktop_changes(
+            self._changed
+        )
+        if self._unsubscribe is None:
+            logger.info("No desktop notifications, polling for switches")
+            Thread(target=self._poll, name="history-poll", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._woken.set()
+        if self._unsubscribe:
+            self._unsubscribe()
+
+    def poke(self) -> None:
+        """
+        Resets the polling interval, e.g. after a hotkey was pressed.
+        """
+        self._woken.set()
+
+    def _changed(self, desktop: DesktopId) -> None:
+        try:
+            self._on_change(desktop)
+        except Exception:
+            logger.exception("Failed to record desktop switch")
+
+    def _poll(self) -> None:
+        interval = self._min_interval
+        last: DesktopId | None = None
+        while not self._stopped.is_set():
+            if self._woken.wait(interval):
+                self._woken.clear()
+                interval = self._min_interval
+                continue
+            try:
+                current = self._backend.current_desktop()
+            except CircuitOpenError as e:
+                logger.debug(f"Not polling: {e}")
+                interval = self._max_interval
+                continue
+            except Exception:
+                logger.exception("Failed to poll current desktop")
+                interval = self._max_interval
+                continue
+            if current != last:
+                self._changed(current)
+                last = current
+                interval = self._min_interval
+            else:
+                interval = min(interval * self._backoff, self._max_interval)
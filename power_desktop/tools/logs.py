@@ -1,5 +1,12 @@
+import atexit
 import ctypes
+import gzip
 import logging
+import os
+import shutil
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
 from typing import Any
 
 from colorama import Fore, Style, init
@@ -47,20 +54,112 @@ class CustomFormatter(logging.Formatter):
         return name
 
     def format(self, record: Any):
+        # Other handlers see the same record, so format a copy.
+        record = logging.makeLogRecord(record.__dict__)
         record.name = self._get_name_emoji(record.name)
         formatter = self.formatters[record.levelno]
         return formatter.format(record)
 
 
-def setup_logs():
+class RollingFileHandler(RotatingFileHandler):
+    """
+    Rotates when the file reaches `maxBytes` or gets older than `max_age`
+    seconds, optionally gzipping the rotated files.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int,
+        max_age: float,
+        backup_count: int,
+        compress: bool,
+    ):
+        super().__init__(
+            filename,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+        )
+        self._max_age = max_age
+        self._stamp = self.baseFilename + ".created"
+        self._opened = self._load_opened()
+        if compress:
+            self.namer = lambda name: name + ".gz"
+            self.rotator = _gzip_rotator
+
+    def _load_opened(self) -> float:
+        """
+        When the current file was started. It's kept in a sidecar file
+        rather than read from the creation time, which Windows carries over
+        from a deleted file to a new one with the same name.
+        """
+        try:
+            if os.path.getsize(self.baseFilename) > 0:
+                with open(self._stamp, encoding="utf-8") as f:
+                    return float(f.read())
+        except (OSError, ValueError):
+            pass
+        return self._mark_opened()
+
+    def _mark_opened(self) -> float:
+        now = time.time()
+        try:
+            with open(self._stamp, "w", encoding="utf-8") as f:
+                f.write(repr(now))
+        except OSError:
+            pass
+        return now
+
+    def shouldRollover(self, record: logging.LogRecord) -> int:
+        if time.time() - self._opened >= self._max_age:
+            return 1
+        return super().shouldRollover(record)
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self._opened = self._mark_opened()
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+_listener: QueueListener | None = None
+
+
+def setup_logs(
+    filename: str = "log.log",
+    max_bytes: int = 5 * 1024 * 1024,
+    max_age: float = 7 * 24 * 3600,
+    backup_count: int = 5,
+    compress: bool = True,
+):
+    """
+    Loggers only enqueue records; a background listener formats them and
+    writes them to the console and a rotating log file.
+    """
+    global _listener
     init(autoreset=True)
     ctypes.windll.shcore.SetProcessDpiAwareness(1)
     ch = logging.StreamHandler()
     # Set a format for the console handler
     ch.setFormatter(CustomFormatter())
-    file_handler = logging.FileHandler("log.log", encoding="utf-8")
-    # Add the console handler to the logger
-    logging.basicConfig(handlers=[ch, file_handler], level=logging.INFO)
+    file_handler = RollingFileHandler(
+        filename, max_bytes, max_age, backup_count, compress
+    )
+    file_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+    )
+    queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    _listener = QueueListener(
+        queue, ch, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(stop_logs)
+    logging.basicConfig(handlers=[QueueHandler(queue)], level=logging.INFO)
     logger_names = [
         "react_tk",
         "keyweave",
@@ -69,4 +168,16 @@ def setup_logs():
     loggers = [logging.getLogger(name) for name in logger_names]
     for logger in loggers:
         logger.setLevel(logging.INFO)
-    logging.getLogger("apscheduler").propagate = False
+
+
+def stop_logs():
+    """
+    Writes out everything still queued. Call before exiting with os._exit,
+    which skips atexit handlers.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,210 @@
+import os
+from bisect import bisect_left
+from logging import getLogger
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = getLogger("power_desktop")
+
+PREFIX = "power_desktop_"
+
+# Upper bounds of the latency buckets, 0.5ms doubling up to ~8s.
+LATENCY_BOUNDS = tuple(0.0005 * 2**i for i in range(15))
+COUNT_BOUNDS: tuple[float, ...] = (1, 2, 4, 8, 16, 32, 64)
+
+type Labels = tuple[tuple[str, str], ...]
+
+
+class Counter:
+    """
+    A monotonically increasing count.
+
+    Updates are plain integer additions without a lock. Under the GIL the
+    worst a concurrent update can do is lose an increment, which is an
+    acceptable price for keeping the hot path cheap.
+    """
+
+    kind = "counter"
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def samples(self, name: str, labels: Labels) -> list[str]:
+        return [f"{name}{_labels(labels)} {self.value}"]
+
+
+class Gauge:
+    """
+    A value that can go up and down, set by whoever owns it.
+    """
+
+    kind = "gauge"
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def samples(self, name: str, labels: Labels) -> list[str]:
+        return [f"{name}{_labels(labels)} {self.value:g}"]
+
+
+class Histogram:
+    """
+    Counts observations into fixed buckets, so memory doesn't grow with the
+    number of observations. Same locking trade-off as Counter.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BOUNDS):
+        self._bounds = bounds
+        # The last bucket is +Inf.
+        self._buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._buckets[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def samples(self, name: str, labels: Labels) -> list[str]:
+        lines: list[str] = []
+        seen = 0
+        for bound, n in zip(self._bounds + (float("inf"),), self._buckets):
+            seen += n
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(
+                f"{name}_bucket{_labels(labels + (('le', le),))} {seen}"
+            )
+        lines.append(f"{name}_sum{_labels(labels)} {self.sum:g}")
+        lines.append(f"{name}_count{_labels(labels)} {self.count}")
+        return lines
+
+
+type Metric = Counter | Gauge | Histogram
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return f"{{{inner}}}"
+
+
+class Registry:
+    """
+    Holds every metric by name and labels.
+
+    Lookups of existing metrics don't lock; only creating one does.
+    """
+
+    def __init__(self):
+        self._metrics: dict[tuple[str, Labels], Metric] = {}
+        self._help: dict[str, str] = {}
+        self._lock = Lock()
+
+    def _get(
+        self,
+        name: str,
+        help: str,
+        labels: dict[str, str],
+        factory: Callable[[], Metric],
+    ) -> Metric:
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = factory()
+                    self._help.setdefault(name, help)
+        return metric
+
+    def counter(self, name: str, help: str, **labels: str) -> Counter:
+        metric = self._get(name, help, labels, Counter)
+        assert isinstance(metric, Counter)
+        return metric
+
+    def gauge(self, name: str, help: str, **labels: str) -> Gauge:
+        metric = self._get(name, help, labels, Gauge)
+        assert isinstance(metric, Gauge)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        bounds: tuple[float, ...] = LATENCY_BOUNDS,
+        **labels: str,
+    ) -> Histogram:
+        metric = self._get(name, help, labels, lambda: Histogram(bounds))
+        assert isinstance(metric, Histogram)
+        return metric
+
+    def render(self) -> str:
+        """
+        A snapshot in the Prometheus text exposition format.
+        """
+        by_name: dict[str, list[tuple[Labels, Metric]]] = {}
+        for (name, labels), metric in list(self._metrics.items()):
+            by_name.setdefault(name, []).append((labels, metric))
+        lines: list[str] = []
+        for name, metrics in sorted(by_name.items()):
+            full = PREFIX + name
+            lines.append(f"# HELP {full} {self._help[name]}")
+            lines.append(f"# TYPE {full} {metrics[0][1].kind}")
+            for labels, metric in sorted(metrics, key=lambda x: x[0]):
+                lines.extend(metric.samples(full, labels))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def dump_metrics(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+
+
+def serve_metrics_from_env() -> "ThreadingHTTPServer | None":
+    """
+    Serves the metrics on 127.0.0.1 if POWER_DESKTOP_METRICS_PORT is set.
+    """
+    port = os.environ.get("POWER_DESKTOP_METRICS_PORT")
+    if not port:
+        return None
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", int(port)), _Handler)
+    except (OSError, ValueError):
+        logger.exception(f"Couldn't serve metrics on port {port}")
+        return None
+    Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+    return server
@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from collections.abc import Container
+from threading import Lock
+from time import monotonic
+from typing import Callable
+
+from power_desktop.backend.base import DesktopId
+
+
+class MruIndex:
+    """
+    Ranks desktops by how recently and how often they were visited.
+
+    Recency is an OrderedDict used as a linked list, so a visit is O(1).
+    Frequency is a count per desktop that halves every `half_life` seconds;
+    it's decayed lazily, when the desktop is visited or ranked.
+
+    The history tracker visits from its own thread while commands rank, so
+    every public method holds a lock.
+    """
+
+    def __init__(
+        self,
+        half_life: float = 30 * 60,
+        cycle_timeout: float = 1.5,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self._half_life = half_life
+        self._cycle_timeout = cycle_timeout
+        self._clock = clock
+        self._recent: OrderedDict[DesktopId, None] = OrderedDict()
+        # Score and when it was last decayed.
+        self._scores: dict[DesktopId, tuple[float, float]] = {}
+        self._cycle: list[DesktopId] = []
+        self._cycled_at = float("-inf")
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._recent)
+
+    def _score(self, id: DesktopId, now: float) -> float:
+        score, at = self._scores.get(id, (0.0, now))
+        return score * 0.5 ** ((now - at) / self._half_life)
+
+    def visit(self, id: DesktopId) -> None:
+        """
+        Records a switch to `id`. Reporting the current desktop again, as
+        several sources may, doesn't count as another visit.
+        """
+        with self._lock:
+            if self._recent and next(reversed(self._recent)) == id:
+                return
+            now = self._clock()
+            self._scores[id] = (self._score(id, now) + 1, now)
+            self._recent[id] = None
+            self._recent.move_to_end(id)
+
+    def previous(
+        self, current: DesktopId, present: Container[DesktopId]
+    ) -> DesktopId | None:
+        """
+        The most recently used desktop other than `current`.
+        """
+        with self._lock:
+            for id in reversed(self._recent):
+                if id != current and id in present:
+                    return id
+            return None
+
+    def top(self, k: int, present: Container[DesktopId]) -> list[DesktopId]:
+        """
+        The `k` most used desktops, with ties going to the most recent.
+        """
+        with self._lock:
+            return self._top(k, present)
+
+    def _top(self, k: int, present: Container[DesktopId]) -> list[DesktopId]:
+        now = self._clock()
+        recency = {id: i for i, id in enumerate(self._recent)}
+        ranked = sorted(
+            (id for id in self._recent if id in present),
+            key=lambda id: (self._score(id, now), recency[id]),
+            reverse=True,
+        )
+        return ranked[:k]
+
+    def cycle(
+        self, current: DesktopId, k: int, present: Container[DesktopId]
+    ) -> DesktopId | None:
+        """
+        The next of the top `k` desktops after `current`.
+
+        Presses within `cycle_timeout` of each other keep cycling through
+        the ranking taken at the first press, since the visits they cause
+        would otherwise reorder it.
+        """
+        with self._lock:
+            now = self._clock()
+            stale = now - self._cycled_at > self._cycle_timeout
+            if stale or current not in self._cycle:
+                self._cycle = self._top(k, present)
+            self._cycled_at = now
+            candidates = [id for id in self._cycle if id in present]
+        if not candidates or candidates == [current]:
+            return None
+        if current not in candidates:
+            return candidates[0]
+        return candidates[(candidates.index(current) + 1) % len(candidates)]
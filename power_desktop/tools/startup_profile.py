@@ -0,0 +1,102 @@
+"""
+Measures how long each import and startup stage takes, like
+`python -X importtime` but built in, so it also works in the frozen build.
+
+Enable with POWER_DESKTOP_STARTUP_PROFILE=1 or the --startup-profile flag.
+`install()` has to run before the imports worth measuring.
+"""
+
+import builtins
+import os
+import sys
+from dataclasses import dataclass
+from logging import getLogger
+from threading import Lock, local
+from time import perf_counter_ns
+from typing import Any
+
+logger = getLogger("power_desktop")
+
+_started = perf_counter_ns()
+_original_import = builtins.__import__
+_lock = Lock()
+_local = local()
+
+
+@dataclass
+class ImportTiming:
+    name: str
+    depth: int
+    # Time spent in this import alone, and including nested imports.
+    self_ns: int = 0
+    total_ns: int = 0
+
+
+imports: list[ImportTiming] = []
+marks: list[tuple[str, int]] = []
+_reported = False
+
+
+def enabled() -> bool:
+    return (
+        os.environ.get("POWER_DESKTOP_STARTUP_PROFILE") == "1"
+        or "--startup-profile" in sys.argv
+    )
+
+
+def _timed_import(name: str, *args: Any, **kwargs: Any) -> Any:
+    level = args[3] if len(args) > 3 else kwargs.get("level", 0)
+    if level or name in sys.modules:
+        return _original_import(name, *args, **kwargs)
+    stack: list[ImportTiming] = getattr(_local, "stack", [])
+    _local.stack = stack
+    timing = ImportTiming(name, len(stack))
+    with _lock:
+        imports.append(timing)
+    stack.append(timing)
+    start = perf_counter_ns()
+    try:
+        return _original_import(name, *args, **kwargs)
+    finally:
+        timing.total_ns = perf_counter_ns() - start
+        stack.pop()
+        timing.self_ns += timing.total_ns
+        if stack:
+            stack[-1].self_ns -= timing.total_ns
+
+
+def install() -> None:
+    if enabled():
+        builtins.__import__ = _timed_import
+
+
+def mark(stage: str) -> None:
+    """
+    Records how long after startup a stage was reached.
+    """
+    if builtins.__import__ is _timed_import:
+        marks.append((stage, perf_counter_ns() - _started))
+
+
+def report(top: int = 25) -> str | None:
+    """
+    Stops measuring imports and logs the slowest ones and the stages.
+    Only the first call reports.
+    """
+    global _reported
+    if builtins.__import__ is not _timed_import or _reported:
+        return None
+    _reported = True
+    builtins.__import__ = _original_import
+    lines = ["Startup profile", f"{'stage':<50}{'ms':>10}"]
+    lines.extend(f"{stage:<50}{ns / 1e6:>10.1f}" for stage, ns in marks)
+    lines.append(f"{'import':<50}{'self ms':>10}{'total ms':>10}")
+    slowest = sorted(imports, key=lambda x: x.total_ns, reverse=True)[:top]
+    lines.extend(
+        f"{'  ' * t.depth + t.name:<50}"
+        f"{t.self_ns / 1e6:>10.1f}{t.total_ns / 1e6:>10.1f}"
+        for t in slowest
+    )
+    text = "\n".join(lines)
+    logger.info(text)
+    return text
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+from collections import deque
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from itertools import count
+from time import perf_counter_ns
+from typing import Any
+
+# Spans are cheap enough to always record. Set POWER_DESKTOP_TRACE=0 to
+# turn them off anyway.
+enabled = os.environ.get("POWER_DESKTOP_TRACE", "1") != "0"
+
+
+@dataclass(frozen=True, slots=True)
+class SpanRecord:
+    name: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+    thread_name: str
+    depth: int
+    args: dict[str, Any] = field(default_factory=dict[str, Any])
+    # Set for spans that may overlap others on their thread.
+    async_id: int | None = field(default=None)
+
+
+_spans: deque[SpanRecord] = deque(maxlen=20_000)
+_local = threading.local()
+_async_ids = count(1)
+
+
+def _depth() -> int:
+    return getattr(_local, "depth", 0)
+
+
+def add_span(
+    name: str,
+    start_ns: int,
+    end_ns: int,
+    overlapping: bool = False,
+    **args: Any,
+) -> None:
+    """
+    Records a span that was timed elsewhere, e.g. time spent in a queue.
+
+    An `overlapping` span didn't run on the recording thread and may overlap
+    its other spans, so it's written as an async event that doesn't nest.
+    """
+    if not enabled:
+        return
+    thread = threading.current_thread()
+    _spans.append(
+        SpanRecord(
+            name,
+            start_ns,
+            end_ns - start_ns,
+            threading.get_ident(),
+            thread.name,
+            _depth(),
+            args,
+            next(_async_ids) if overlapping else None,
+        )
+    )
+
+
+@contextmanager
+def span(name: str, **args: Any) -> Generator[None]:
+    if not enabled:
+        yield
+        return
+    depth = _depth()
+    _local.depth = depth + 1
+    start = perf_counter_ns()
+    try:
+        yield
+    finally:
+        _local.depth = depth
+        add_span(name, start, perf_counter_ns(), **args)
+
+
+def spans() -> list[SpanRecord]:
+    return list(_spans)
+
+
+def dump_chrome(path: str) -> None:
+    """
+    Writes the buffered spans as Chrome trace_event JSON, which can be
+    opened in chrome://tracing or Perfetto.
+    """
+    pid = os.getpid()
+    records = spans()
+    events: list[dict[str, Any]] = [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": tid,
+            "args": {"name": name},
+        }
+        for tid, name in {(r.thread_id, r.thread_name) for r in records}
+    ]
+    for r in records:
+        event: dict[str, Any] = {
+            "name": r.name,
+            "ts": r.start_ns / 1000,
+            "pid": pid,
+            "tid": r.thread_id,
+            "args": r.args,
+        }
+        if r.async_id is None:
+            events.append({**event, "ph": "X", "dur": r.duration_ns / 1000})
+            continue
+        # Begin and end of an async event, which gets its own track.
+        async_event = {**event, "cat": r.name, "id": r.async_id}
+        events.append({**async_event, "ph": "b"})
+        end_ts = (r.start_ns + r.duration_ns) / 1000
+        events.append({**async_event, "ph": "e", "ts": end_ts})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def dump_jsonl(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for r in spans():
+            f.write(json.dumps(asdict(r), default=str))
+            f.write("\n")
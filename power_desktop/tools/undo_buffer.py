@@ -1,65 +1,104 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Deque
+from array import array
+from threading import Lock
+from uuid import UUID
 
 from power_desktop.model.model_1d import VdHistoryEntry
+from power_desktop.tools.metrics import registry
+
+_pushes = registry.counter("history_pushes_total", "Pans added to the history.")
+_dedups = registry.counter(
+    "history_dedups_total", "Pans not added because they repeat the top entry."
+)
+
+_GUID = 16
 
 
 class UndoBuffer:
     """
     Undo/redo ring buffer for VdHistoryEntry.
 
-    Storage: deque[VdHistoryEntry] with maxlen=1024
+    Storage: fixed-width slots, `maxlen` of them. Each desktop GUID is 16
+    bytes of one bytearray and its position is an item of an int array, so
+    even a large `maxlen` stays compact.
+
+    `head`, `cursor` and `tail` are absolute counters that only grow; an
+    entry's slot is its counter modulo `maxlen`. The live entries are
+    [head, tail) and the cursor points at the current one.
 
     Behavior:
     - push(state):
-        Remove all redo states (anything right of current index), append state,
-        and set cursor to the newest item.
-    - undo() -> Optional[VdHistoryEntry]:
-        Move the cursor one step to the left and return that entry.
-        Does not modify the deque.
-    - redo() -> Optional[VdHistoryEntry]:
-        Move the cursor one step to the right and return that entry.
-        Does not modify the deque.
+        Drops all redo states by moving the tail to just past the cursor,
+        writes the state there and moves the cursor to it. When full, the
+        oldest entry is evicted by moving the head.
+    - undo() / redo():
+        Move the cursor one step left / right and return that entry.
+
+    The tracker pushes from the event thread while commands undo and redo,
+    so every public method holds a lock.
     """
 
     def __init__(self, initial_state: VdHistoryEntry, maxlen: int = 1024):
-        self._buffer: Deque[VdHistoryEntry] = deque(maxlen=maxlen)
-        self._buffer.append(initial_state)
-        # Cursor points to the current position. After a push, it points to the last element.
-        self._index = 0
+        self._maxlen = maxlen
+        self._ids = bytearray(_GUID * maxlen)
+        self._indexes = array("I", bytes(4 * maxlen))
+        self._head = 0
+        self._cursor = 0
+        self._tail = 1
+        self._lock = Lock()
+        self._write(0, initial_state)
 
     def __len__(self) -> int:
-        return len(self._buffer)
+        with self._lock:
+            return self._tail - self._head
+
+    def _write(self, n: int, entry: VdHistoryEntry) -> None:
+        slot = n % self._maxlen
+        self._ids[slot * _GUID : (slot + 1) * _GUID] = entry.id.bytes
+        self._indexes[slot] = entry.index
+
+    def _read(self, n: int) -> VdHistoryEntry:
+        slot = n % self._maxlen
+        guid = bytes(self._ids[slot * _GUID : (slot + 1) * _GUID])
+        return VdHistoryEntry(UUID(bytes=guid), self._indexes[slot])
+
+    def _holds(self, n: int, entry: VdHistoryEntry) -> bool:
+        slot = n % self._maxlen
+        guid = bytes(self._ids[slot * _GUID : (slot + 1) * _GUID])
+        return guid == entry.id.bytes
 
     def undo(self) -> VdHistoryEntry:
         """
         Returns the previous history entry and moves the cursor left.
         Does not mutate the buffer contents.
         """
-
-        if self._index == 0:
-            # Already at the oldest entry
-            raise IndexError("Cannot undo further")
-        self._index -= 1
-        return self._buffer[self._index]
+        with self._lock:
+            if self._cursor == self._head:
+                # Already at the oldest entry
+                raise IndexError("Cannot undo further")
+            self._cursor -= 1
+            return self._read(self._cursor)
 
     def redo(self) -> VdHistoryEntry:
+        with self._lock:
+            if self._cursor >= self._tail - 1:
+                # Already at the newest entry
+                raise IndexError("Cannot redo further")
+            self._cursor += 1
+            return self._read(self._cursor)
 
-        if self._index >= len(self._buffer) - 1:
-            # Already at the newest entry
-            raise IndexError("Cannot redo further")
-        self._index += 1
-        return self._buffer[self._index]
-
-    def push(self, state: VdHistoryEntry) -> None:
-        top_entry = self._buffer[self._index]
-        if state == top_entry:
-            return
-        # Remove all redo entries
-        while len(self._buffer) - 1 > self._index:
-            self._buffer.pop()
-        # Append and set cursor to newest
-        self._buffer.append(state)
-        self._index = len(self._buffer) - 1
+    def push(self, state: VdHistoryEntry) -> bool:
+        """
+        Returns False if `state` was dropped for repeating the current entry.
+        """
+        with self._lock:
+            if self._holds(self._cursor, state):
+                _dedups.inc()
+                return False
+            _pushes.inc()
+            self._cursor += 1
+            self._tail = self._cursor + 1
+            self._head = max(self._head, self._tail - self._maxlen)
+            self._write(self._cursor, state)
+            return True
@@ -1,62 +1,101 @@
 # pyright: reportUnknownParameterType=false
 
 from dataclasses import dataclass
-from typing import Any, override
+from functools import lru_cache
+from typing import Any
 
 
 from react_tk import (
-    Font,
     Widget,
     Component,
     Window,
     ToolTipLabel,
 )
 
-from power_desktop.ui.parts.close_view import StopView
-from power_desktop.ui.parts.command_header import DesktopCommandHeader
+from power_desktop.tools.metrics import registry
+from power_desktop.ui.hud_frame import Slot, blank_slot, transparent_c
+from power_desktop.ui.parts.close_view import stop_slots
+from power_desktop.ui.parts.command_header import header_slot
 from power_desktop.ui.desktop_status import (
-    App,
     DesktopAction,
     DesktopActionFail,
     DesktopActionOkay,
     ProgramStopping,
     ProgramStarted,
 )
-from power_desktop.ui.parts.error_info import FailInfo
-from power_desktop.ui.parts.okay_action import OkayView
-from power_desktop.ui.parts.start_view import StartView
-from power_desktop.util.str import truncate_text
+from power_desktop.ui.parts.error_info import fail_slots
+from power_desktop.ui.parts.okay_action import MAX_OKAY_SLOTS, okay_slots
+from power_desktop.ui.parts.start_view import start_slots
+
+# The most labels any frame uses: the header, and the body of an okay frame,
+# which is the largest.
+SLOT_COUNT = 1 + MAX_OKAY_SLOTS
+
+_frames = registry.counter("hud_frames_total", "HUD frames rendered.")
+
+
+@lru_cache(maxsize=64)
+def _label(slot: Slot) -> Widget:
+    """
+    Labels are cached by content, so a slot that didn't change between
+    frames is the same element and react_tk has nothing to update.
+    """
+    props: dict[str, Any] = {}
+    if slot.justify:
+        props["justify"] = slot.justify
+    pack: dict[str, Any] = {}
+    if slot.ipady:
+        pack["ipady"] = slot.ipady
+    if slot.anchor:
+        pack["anchor"] = slot.anchor
+    return ToolTipLabel(
+        text=slot.text,
+        background=slot.background,
+        foreground=slot.foreground,
+        font=slot.font,
+        **props,
+    ).Pack(ipadx=slot.ipadx, fill=slot.fill, **pack)
+
+
+@lru_cache(maxsize=16)
+def _frame(slots: tuple[Slot, ...]) -> Window:
+    return Window(
+        background=transparent_c,
+        topmost=True,
+        transparent_color="black",
+        override_redirect=True,
+    ).Geometry(width=420, height=250, x=-5, y=-85, anchor_point="rb")[
+        *(_label(slot) for slot in slots)
+    ]
 
 
 @dataclass
 class DestkopHUD(Component[Window]):
+    """
+    The HUD window is never torn down. Hiding it blanks every slot, which
+    leaves a window that is entirely the transparent colour.
+    """
 
-    def _get_body_component(self, executed: DesktopAction):
+    def _get_body_slots(self, executed: DesktopAction) -> tuple[Slot, ...]:
         match executed:
             case DesktopActionOkay() as r:
-                return OkayView(desktop_action=r)
+                return okay_slots(r)
             case DesktopActionFail() as e:
-                return FailInfo(fail=e)
+                return fail_slots(e)
             case ProgramStarted() as p:
-                return StartView(started=p)
+                return start_slots(p)
             case ProgramStopping() as p:
-                return StopView(stopped=p)
+                return stop_slots(p)
             case _ as e:
                 raise NotImplementedError(f"Unknown action {e}")
 
     def render(self):
+        _frames.inc()
         if self.ctx.hidden == True:
-            return ()
-        items: list[Component[Widget]] = [
-            DesktopCommandHeader(input=self.ctx.executed),
-            self._get_body_component(self.ctx.executed),
-        ]
-
-        return Window(
-            background="#000000",
-            topmost=True,
-            transparent_color="black",
-            override_redirect=True,
-        ).Geometry(width=420, height=250, x=-5, y=-85, anchor_point="rb")[
-            *items
-        ]
+            return _frame((blank_slot,) * SLOT_COUNT)
+        slots = (
+            header_slot(self.ctx.executed),
+            *self._get_body_slots(self.ctx.executed),
+        )
+        assert len(slots) <= SLOT_COUNT, f"Frame has {len(slots)} slots"
+        return _frame(slots + (blank_slot,) * (SLOT_COUNT - len(slots)))
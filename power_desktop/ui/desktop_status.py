@@ -1,12 +1,12 @@
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
-from pywinauto.win32_element_info import (  # pyright: ignore[reportMissingTypeStubs]
-    HwndElementInfo,
-)
 from keyweave import HotkeyEvent
 
+from power_desktop.backend.base import WindowInfo
 from power_desktop.model.model_1d import Desktop1D, Index1D
+from power_desktop.tools.batch_move import MoveReport
+from power_desktop.tools.exec_reinit_vda_managers import ComHealth
 
 
 class DesktopActionReal:
@@ -17,9 +17,9 @@ class App:
     title: str
     hwnd: int
 
-    def __init__(self, hwnd_info: HwndElementInfo):
-        self.hwnd = hwnd_info.handle  # type: ignore
-        self.title = hwnd_info.name  # type: ignore
+    def __init__(self, window: WindowInfo):
+        self.hwnd = window.hwnd
+        self.title = window.title
 
 
 class Pan(DesktopActionReal):
@@ -35,14 +35,34 @@ class Shove(DesktopActionReal):
 
     def __init__(
         self,
-        app_view: HwndElementInfo | tuple[HwndElementInfo, ...],
+        report: MoveReport,
         start: Index1D,
         end: Index1D,
     ):
-        self.apps = tuple(
-            App(app)
-            for app in (app_view if isinstance(app_view, tuple) else [app_view])
-        )
+        self.apps = tuple(App(app) for app in report.moved)
+        self.failed = tuple(App(app) for app, _ in report.failed)
+        self.start = start
+        self.end = end
+
+    start: Index1D
+    end: Index1D
+
+
+class Bulk(DesktopActionReal):
+    """
+    Many windows moved at once by gather, evacuate or swap.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        report: MoveReport,
+        start: Index1D,
+        end: Index1D,
+    ):
+        self.kind = kind
+        self.count = len(report.moved)
+        self.failed = tuple(App(app) for app, _ in report.failed)
         self.start = start
         self.end = end
 
@@ -74,6 +94,7 @@ class ProgramStopping:
 class DesktopActionFail:
     event: HotkeyEvent
     error: BaseException
+    com_health: ComHealth | None = field(default=None)
 
     @property
     def headline(self):
@@ -85,9 +106,25 @@ class DesktopActionOkay:
     event: HotkeyEvent
     pan: Pan | None = field(default=None)
     shove: Shove | None = field(default=None)
+    bulk: Bulk | None = field(default=None)
+    # How many presses were coalesced into this action.
+    repeat: int = field(default=1)
+    # Shown instead of desktops by commands that don't pan or shove.
+    note: str | None = field(default=None)
+    # How many windows the target desktop has, if known.
+    window_count: int | None = field(default=None)
+
+    @property
+    def moved(self) -> Bulk | Shove | Pan | None:
+        """
+        The part of the action that says where things started and ended.
+        """
+        return self.bulk or self.shove or self.pan
 
     @property
     def headline(self):
+        if self.repeat > 1:
+            return f"{self.event.command} ×{self.repeat}"
         return str(self.event.command)
 
 
@@ -0,0 +1,55 @@
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Literal
+
+from react_tk import Font
+
+type Fill = Literal["both", "x", "y", "none"]
+
+# Window background. The HUD window treats this colour as transparent.
+transparent_c = "#000000"
+
+
+@cache
+def get_font(size: int, style: str | None = None) -> Font:
+    """
+    Fonts are shared between frames so unchanged labels compare equal.
+    """
+    if style is None:
+        return Font(family="Segoe UI Emoji", size=size)
+    return Font(family="Segoe UI Emoji", size=size, style=style)
+
+
+@dataclass(frozen=True)
+class Slot:
+    """
+    The contents of one HUD label. The HUD always shows the same number of
+    labels and only their contents change between frames.
+    """
+
+    text: str
+    background: str
+    foreground: str = field(default="#ffffff")
+    size: int = field(default=17)
+    style: str | None = field(default="normal")
+    justify: str | None = field(default=None)
+    ipadx: int = field(default=15)
+    ipady: int = field(default=0)
+    fill: Fill = field(default="both")
+    anchor: str | None = field(default=None)
+
+    @property
+    def font(self) -> Font:
+        return get_font(self.size, self.style)
+
+
+# An unused slot: empty and the transparent colour, so it can't be seen.
+blank_slot = Slot(
+    text="",
+    background=transparent_c,
+    foreground=transparent_c,
+    size=1,
+    style=None,
+    ipadx=0,
+    fill="x",
+)
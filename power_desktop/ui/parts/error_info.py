@@ -1,18 +1,28 @@
-from dataclasses import dataclass
-from react_tk import Component, Widget, Font, ToolTipLabel
-
+from power_desktop.tools.exec_reinit_vda_managers import (
+    BreakerState,
+    CircuitOpenError,
+)
 from power_desktop.ui.desktop_status import DesktopActionFail
+from power_desktop.ui.hud_frame import Slot
 
 
-@dataclass
-class FailInfo(Component[Widget]):
-    fail: DesktopActionFail
-
-    def render(self):
-        yield ToolTipLabel(
-            text=str(self.fail.error),
-            background="#FF0000",
-            justify="center",
-            foreground="#ffffff",
-            font=Font(family="Segoe UI Emoji", size=17, style="normal"),
-        ).Pack(ipadx=15, fill="both")
+def fail_slots(fail: DesktopActionFail) -> tuple[Slot, ...]:
+    slots = [
+        Slot(text=str(fail.error), background="#FF0000", justify="center"),
+    ]
+    health = fail.com_health
+    if (
+        health
+        and health.state is not BreakerState.CLOSED
+        and not isinstance(fail.error, CircuitOpenError)
+    ):
+        slots.append(
+            Slot(
+                text=str(health),
+                background="#7F0000",
+                justify="center",
+                size=11,
+                fill="x",
+            )
+        )
+    return tuple(slots)
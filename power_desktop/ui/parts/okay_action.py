@@ -1,48 +1,59 @@
-from dataclasses import dataclass
-from react_tk import Component, Widget, Font, ToolTipLabel
-
 from power_desktop.ui.desktop_status import DesktopActionOkay
 from power_desktop.ui.colors import green_c, old_desktop_c
-from power_desktop.ui.parts.win_title_view import WinTitleView
+from power_desktop.ui.hud_frame import Slot
+from power_desktop.ui.parts.win_title_view import win_title_slots
 
 
-@dataclass
-class OkayView(Component[Widget]):
-    desktop_action: DesktopActionOkay
+# The most slots `okay_slots` returns: the desktop, the window titles and
+# "more", failures, and the previous desktop.
+MAX_OKAY_SLOTS = 5
 
-    def render(self):
-        executed = self.desktop_action
-        orig_desktop = (
-            executed.shove.start if executed.shove else executed.pan.start  # type: ignore
-        )
-        new_desktop = (
-            executed.shove.end if executed.shove else executed.pan.end  # type: ignore
-        )
-        yield ToolTipLabel(
-            text=f"🖥️ {new_desktop.name}{" 👁️" if self.desktop_action.pan else ""}",
-            background=green_c,
-            foreground="#ffffff",
-            font=Font(
-                family="Segoe UI Emoji",
-                size=17,
-                style="normal",
-            ),
-        ).Pack(ipadx=15, fill="both")
 
-        if shove := executed.shove:
-            yield WinTitleView(
-                executed=executed,
-                apps=shove.apps,
+def okay_slots(desktop_action: DesktopActionOkay) -> tuple[Slot, ...]:
+    executed = desktop_action
+    if executed.note is not None:
+        return (Slot(text=executed.note, background=green_c, fill="x"),)
+    orig_desktop = executed.moved.start  # type: ignore
+    new_desktop = executed.moved.end  # type: ignore
+    text = f"🖥️ {new_desktop.name}{" 👁️" if desktop_action.pan else ""}"
+    if executed.window_count is not None:
+        text += f"  🪟 {executed.window_count}"
+    slots = [Slot(text=text, background=green_c)]
+
+    if bulk := executed.bulk:
+        slots.append(
+            Slot(
+                text=f"📦 {bulk.kind}: {bulk.count} moved",
+                background=green_c,
+                justify="center",
+                size=11,
+                fill="x",
             )
+        )
+        failed = bulk.failed
+    elif shove := executed.shove:
+        slots.extend(win_title_slots(executed, shove.apps))
+        failed = shove.failed
+    else:
+        failed = ()
+    if failed:
+        slots.append(
+            Slot(
+                text=f"⚠️ {len(failed)} couldn't be moved",
+                background="#FF0000",
+                justify="center",
+                size=11,
+                fill="x",
+            )
+        )
 
-        yield ToolTipLabel(
+    slots.append(
+        Slot(
             text=f"↩️ {orig_desktop.name}",
             background=old_desktop_c,
-            foreground="#ffffff",
             justify="center",
-            font=Font(
-                family="Segoe UI Emoji",
-                size=11,
-                style="normal",
-            ),
-        ).Pack(ipadx=15, fill="x")
+            size=11,
+            fill="x",
+        )
+    )
+    return tuple(slots)
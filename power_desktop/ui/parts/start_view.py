@@ -1,19 +1,14 @@
-from dataclasses import dataclass
-from react_tk import Component, Widget, Font, ToolTipLabel
-
 from power_desktop.ui.colors import green_c
 from power_desktop.ui.desktop_status import ProgramStarted
+from power_desktop.ui.hud_frame import Slot
 
 
-@dataclass
-class StartView(Component[Widget]):
-    started: ProgramStarted
-
-    def render(self):
-        yield ToolTipLabel(
+def start_slots(started: ProgramStarted) -> tuple[Slot, ...]:
+    return (
+        Slot(
             text="Starting PowerDesktops...",
             background=green_c,
             justify="center",
-            foreground="#ffffff",
-            font=Font(family="Segoe UI Emoji", size=13, style="normal"),
-        ).Pack(ipadx=15, fill="both")
+            size=13,
+        ),
+    )
@@ -1,44 +1,45 @@
 from power_desktop.ui.desktop_status import App, DesktopActionOkay
 from power_desktop.util.str import truncate_text
-
-
-from react_tk import Component, Font, ToolTipLabel, Widget
-
-
-from dataclasses import dataclass
 from power_desktop.ui.colors import green_c
+from power_desktop.ui.hud_frame import Slot
 
 
-@dataclass
-class WinTitleView(Component[Widget]):
-    executed: DesktopActionOkay
-    apps: tuple[App, ...]
-
-    def render(self):
-        titles = list(
-            map(
-                lambda x: f"{self.executed.event.command.info.label} {x.title}",
-                self.apps,
-            )
+def win_title_slots(
+    executed: DesktopActionOkay, apps: tuple[App, ...]
+) -> tuple[Slot, ...]:
+    titles = list(
+        map(
+            lambda x: f"{executed.event.command.info.label} {x.title}",
+            apps,
         )
-        elipsis = None
-        if len(titles) > 3:
-            titles = titles[:3]
-            elipsis = f"⋯ ({len(self.apps) - 3}) more ⋯"
-        titles = map(lambda x: truncate_text(x, 34), titles)
-        titles = "\n".join(titles)
-        yield ToolTipLabel(
+    )
+    elipsis = None
+    if len(titles) > 3:
+        titles = titles[:3]
+        elipsis = f"⋯ ({len(apps) - 3}) more ⋯"
+    titles = map(lambda x: truncate_text(x, 34), titles)
+    titles = "\n".join(titles)
+    slots = [
+        Slot(
             text=f"{titles}",
             background=green_c,
             justify="left",
-            foreground="#ffffff",
-            font=Font(family="Segoe UI Emoji", size=10, style="bold"),
-        ).Pack(ipadx=0, anchor="w", fill="both")
-        if elipsis:
-            yield ToolTipLabel(
+            size=10,
+            style="bold",
+            ipadx=0,
+            anchor="w",
+        )
+    ]
+    if elipsis:
+        slots.append(
+            Slot(
                 text=elipsis,
                 background=green_c,
                 justify="center",
-                foreground="#ffffff",
-                font=Font(family="Segoe UI Emoji", size=8),
-            ).Pack(ipadx=0, fill="x")
+                size=8,
+                style=None,
+                ipadx=0,
+                fill="x",
+            )
+        )
+    return tuple(slots)
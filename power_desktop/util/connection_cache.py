@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Callable
+
+from power_desktop.tools.metrics import registry
+
+_hits = registry.counter(
+    "connection_cache_hits_total", "Process connections reused."
+)
+_misses = registry.counter(
+    "connection_cache_misses_total", "Process connections made."
+)
+_evictions = registry.counter(
+    "connection_cache_evictions_total", "Process connections dropped."
+)
+
+
+class ConnectionCache[C]:
+    """
+    Keeps connections to processes, keyed by PID, so they can be reused.
+
+    Entries are dropped when their process is no longer alive, when they're
+    older than `ttl` seconds, or when more than `maxsize` are held (least
+    recently used first).
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[int], C],
+        is_alive: Callable[[C], bool],
+        maxsize: int = 16,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self._connect = connect
+        self._is_alive = is_alive
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: OrderedDict[int, tuple[C, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, pid: int) -> C:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(pid)
+        if entry is not None:
+            connection, created = entry
+            if now - created < self._ttl and self._is_alive(connection):
+                with self._lock:
+                    if pid in self._entries:
+                        self._entries.move_to_end(pid)
+                _hits.inc()
+                return connection
+            self.evict(pid)
+        connection = self._connect(pid)
+        _misses.inc()
+        with self._lock:
+            self._entries[pid] = (connection, now)
+            self._entries.move_to_end(pid)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                _evictions.inc()
+        return connection
+
+    def evict(self, pid: int) -> None:
+        with self._lock:
+            if self._entries.pop(pid, None) is not None:
+                _evictions.inc()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
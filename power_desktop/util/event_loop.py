@@ -10,12 +10,22 @@ from typing import Any, Callable, Coroutine
 logger = logging.getLogger("power_desktop")
 
 
-def create_event_loop(trace_name: str, workers: int = 1) -> AbstractEventLoop:
+def create_event_loop(
+    trace_name: str,
+    workers: int = 1,
+    initializer: Callable[[], None] | None = None,
+) -> AbstractEventLoop:
+    """
+    `initializer` runs first on the loop thread and on each executor thread,
+    e.g. to initialize COM for them.
+    """
 
     loop = asyncio.new_event_loop()
     ready = threading.Event()
     pool = ThreadPoolExecutor(
-        max_workers=workers, thread_name_prefix=f"{trace_name}"
+        max_workers=workers,
+        thread_name_prefix=f"{trace_name}",
+        initializer=initializer,
     )
 
     def _run_loop() -> None:
@@ -26,6 +36,9 @@ def create_event_loop(trace_name: str, workers: int = 1) -> AbstractEventLoop:
             # Set the executor while the loop is bound to the current thread
             # Signal that the loop/thread is ready
             ready.set()
+            # Nothing scheduled on the loop runs before this
+            if initializer:
+                initializer()
             # Run the loop forever on this thread
             loop.run_forever()
         except Exception:
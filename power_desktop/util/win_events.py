@@ -0,0 +1,110 @@
+# pyright: standard
+import ctypes
+import logging
+import threading
+from ctypes import wintypes
+from typing import Callable
+
+logger = logging.getLogger("power_desktop")
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+WM_QUIT = 0x0012
+GA_ROOT = 2
+GW_OWNER = 4
+
+_WinEventProc = ctypes.WINFUNCTYPE(
+    None,
+    wintypes.HANDLE,
+    wintypes.DWORD,
+    wintypes.HWND,
+    wintypes.LONG,
+    wintypes.LONG,
+    wintypes.DWORD,
+    wintypes.DWORD,
+)
+
+
+def is_app_window(hwnd: int) -> bool:
+    """
+    Whether `hwnd` is a visible, unowned top-level window, the only kind
+    that sits on a virtual desktop. Cheaper to ask than the desktop itself.
+    """
+    user32 = ctypes.windll.user32
+    return (
+        user32.GetAncestor(hwnd, GA_ROOT) == hwnd
+        and bool(user32.IsWindowVisible(hwnd))
+        and not user32.GetWindow(hwnd, GW_OWNER)
+    )
+
+
+def watch_win_events(
+    event_min: int,
+    event_max: int,
+    callback: Callable[[int, int, int, int], None],
+    name: str = "win-events",
+) -> Callable[[], None] | None:
+    """
+    Installs an out-of-context WinEvent hook on a dedicated thread with its
+    own message loop. `callback(event, hwnd, id_object, id_child)` runs on
+    that thread. Returns a function that removes the hook, or None if the
+    hook couldn't be installed.
+    """
+    user32 = ctypes.windll.user32
+    ready = threading.Event()
+    thread_id = 0
+    hooked = False
+
+    def on_event(
+        hook: int,
+        event: int,
+        hwnd: int,
+        id_object: int,
+        id_child: int,
+        thread: int,
+        time: int,
+    ) -> None:
+        try:
+            callback(event, hwnd or 0, id_object, id_child)
+        except Exception:
+            logger.exception("WinEvent callback failed")
+
+    proc = _WinEventProc(on_event)
+
+    def run() -> None:
+        nonlocal thread_id, hooked
+        thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        hook = user32.SetWinEventHook(
+            event_min,
+            event_max,
+            0,
+            proc,
+            0,
+            0,
+            WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS,
+        )
+        hooked = bool(hook)
+        ready.set()
+        if not hook:
+            logger.error("SetWinEventHook failed")
+            return
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        user32.UnhookWinEvent(hook)
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    ready.wait()
+    if not hooked:
+        return None
+
+    def stop() -> None:
+        user32.PostThreadMessageW(thread_id, WM_QUIT, 0, 0)
+
+    return stop
@@ -1,42 +1,57 @@
-# Turn off pyright strict checking for this file
-
 import re
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
 
-# pyright: standard
-from pywinauto import Application
-from pywinauto.win32_element_info import HwndElementInfo
-
-from pyvda import AppView, VirtualDesktop, get_virtual_desktops
+from power_desktop.backend.base import DesktopBackend, WindowInfo
+from power_desktop.tools.tracing import span
 
 pat = re.compile(" - (\\S*)(?: \\(Workspace\\))? - (Visual Studio Code|Obsidian)")
 
 
-def _get_window_substr(hinfo: HwndElementInfo):
-    txt = hinfo.name
+def _get_window_substr(window: WindowInfo):
+    txt = window.title
     m = pat.search(txt)
     if m:
         return m.group(1)
     return None
 
 
+@dataclass(frozen=True)
+class WindowIndex:
+    """
+    One enumeration of top-level windows, grouped by process and the
+    workspace key that `pat` extracts from editor titles.
+    """
+
+    by_workspace: dict[tuple[int, str], tuple[WindowInfo, ...]]
+
+    @staticmethod
+    def build(windows: Iterable[WindowInfo]) -> "WindowIndex":
+        by_workspace: defaultdict[tuple[int, str], list[WindowInfo]] = (
+            defaultdict(list)
+        )
+        for window in windows:
+            if key := _get_window_substr(window):
+                by_workspace[(window.pid, key)].append(window)
+        return WindowIndex({k: tuple(v) for k, v in by_workspace.items()})
+
+    def related(self, window: WindowInfo) -> tuple[WindowInfo, ...]:
+        """
+        The window followed by the other windows of the same workspace.
+        """
+        key = _get_window_substr(window)
+        if not key:
+            return (window,)
+        others = self.by_workspace.get((window.pid, key), ())
+        return (window, *(x for x in others if x.hwnd != window.hwnd))
+
+
 def get_related_windows(
-    av: AppView,
-) -> tuple[tuple[HwndElementInfo, ...], tuple[AppView, ...]]:
-    def f():
-        hinfo = HwndElementInfo(av.hwnd)
-        yield hinfo, av
-        substr = _get_window_substr(hinfo)
-        if not substr:
-            return []
-        proc = hinfo.process_id
-        app = Application().connect(process=proc)
-        rex = re.compile(".*" + substr + ".*")
-        print(rex)
-        ws = app.windows(title_re=rex)
-        for i, x in enumerate(ws):
-            wrapper = HwndElementInfo(x.handle)
-            print(f"Got {i}) {wrapper.rich_text}")
-            yield wrapper, AppView(x.handle)
-
-    r = list(f())
-    return tuple(map(lambda x: x[0], r)), tuple(map(lambda x: x[1], r))
+    backend: DesktopBackend, window: WindowInfo
+) -> tuple[WindowInfo, ...]:
+    if not _get_window_substr(window):
+        return (window,)
+    with span("get_related_windows"):
+        index = WindowIndex.build(backend.list_windows(window.pid))
+        return index.related(window)
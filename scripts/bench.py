@@ -0,0 +1,366 @@
+"""
+Hotkey latency benchmark.
+
+Presses the layout's own hotkey binding for every desktop command, against
+a SimulatedBackend, and reports latency percentiles, backend calls and
+allocations per command. Results are written as JSON so runs from different
+commits can be compared:
+
+    python -m scripts.bench --out before.json
+    python -m scripts.bench --out after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from tempfile import mkdtemp
+from time import perf_counter_ns
+from typing import Any, Callable, cast
+
+from keyweave.bindings import Binding
+from keyweave.hotkey import InputEvent
+
+from power_desktop.backend.base import DesktopBackend
+from power_desktop.backend.com_worker import ComThreadBackend, ComWorker
+from power_desktop.backend.selection import use_backend
+from power_desktop.backend.simulated import SimulatedBackend
+from power_desktop.tools.history_journal import HistoryJournal
+
+_BACKEND_METHODS = (
+    "list_desktops",
+    "current_desktop",
+    "switch_to",
+    "focused_window",
+    "list_windows",
+    "move_window",
+    "subscribe_desktop_changes",
+    "window_desktops",
+    "subscribe_window_changes",
+    "warm_up",
+    "recover",
+)
+# Allocations are measured this many times and the median reported.
+_ALLOC_RUNS = 5
+
+
+class ProfilingBackend:
+    """
+    Counts and times every call made to the wrapped backend.
+    """
+
+    def __init__(self, inner: DesktopBackend):
+        self.transient_errors = inner.transient_errors
+        self.concurrent_moves = inner.concurrent_moves
+        self.calls: Counter[str] = Counter()
+        self.time_ns: Counter[str] = Counter()
+        for name in _BACKEND_METHODS:
+            setattr(self, name, self._timed(name, getattr(inner, name)))
+
+    def _timed(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        def timed(*args: Any) -> Any:
+            start = perf_counter_ns()
+            try:
+                return func(*args)
+            finally:
+                self.calls[name] += 1
+                self.time_ns[name] += perf_counter_ns() - start
+
+        return timed
+
+
+class BenchRoot:
+    """
+    Stands in for the react_tk WindowRoot, optionally forwarding to the real
+    one, and times HUD updates.
+    """
+
+    def __init__(self, inner: Any = None):
+        self._inner = inner
+        self.frames = 0
+        self.time_ns = 0
+
+    def __call__(self, **kwargs: Any) -> None:
+        start = perf_counter_ns()
+        if self._inner is not None:
+            self._inner(**kwargs)
+        self.frames += 1
+        self.time_ns += perf_counter_ns() - start
+
+    @property
+    def ctx(self) -> Any:
+        return self._inner.ctx if self._inner is not None else self
+
+    def schedule(self, delay: float, name: str) -> Callable[[Any], Any]:
+        return lambda f: f
+
+
+# Not desktop commands, and pressing them would quit, press capslock or
+# write files.
+_SKIP = ("no_caps", "quit_power_desktops", "dump_trace", "metrics_snapshot")
+
+
+def _fire(binding: Binding) -> None:
+    """
+    Presses `binding` the way keyweave does, through the wrapper that checks
+    the layout's interceptor handled the event.
+    """
+    coroutine = binding(InputEvent())
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        return
+    coroutine.close()
+    raise RuntimeError(f"{binding} didn't finish synchronously")
+
+
+def _percentile(q: list[float], p: int) -> float:
+    return q[p - 1] if q else 0.0
+
+
+@dataclass
+class Bench:
+    iterations: int
+    latency_ms: float
+    hud: bool
+    coalesce_ms: float
+    com_worker: bool
+    columns: int = 3
+    backend: ProfilingBackend = field(init=False)
+    root: BenchRoot = field(init=False)
+    layout: Any = field(init=False)
+    keyweave_layout: Any = field(init=False)
+
+    def __post_init__(self):
+        sim = SimulatedBackend(desktops=9, latency=self.latency_ms / 1000)
+        # A VS Code workspace with six windows, plus unrelated windows.
+        for i in range(6):
+            sim.add_window(4242, f"file{i}.py - power - Visual Studio Code")
+        sim.add_window(4242, "notes.md - other - Visual Studio Code")
+        sim.add_window(1717, "Inbox - Mail")
+        inner: DesktopBackend = sim
+        if self.com_worker:
+            worker = ComWorker("com")
+            inner = ComThreadBackend(worker, sim)
+        self.backend = ProfilingBackend(inner)
+        # The backend's methods are attached in ProfilingBackend.__init__.
+        use_backend(cast(DesktopBackend, self.backend))
+        os.environ["POWER_DESKTOP_COLUMNS"] = str(self.columns)
+
+        from power_desktop.layout_kw import PowerDesktopLayout
+
+        hud = self.hud
+        bench = self
+
+        class BenchLayout(PowerDesktopLayout):
+            def __post_init__(self):
+                # keyweave returns a Layout, not the layout class instance.
+                bench.layout = self
+                super().__post_init__()
+
+            def _create_journal(self) -> HistoryJournal:
+                return HistoryJournal(os.path.join(mkdtemp(), "history.bin"))
+
+            def _create_root(self) -> Any:
+                inner = super()._create_root() if hud else None
+                bench.root = BenchRoot(inner)
+                return bench.root
+
+        self.keyweave_layout = BenchLayout(on_error=lambda e: None)
+        self.layout._tracker.stop()
+        self.layout._inventory.stop()
+        self.layout._inventory.reconcile()
+        self.layout._warm_up_thread.join()
+        self.layout._pipeline.coalesce_window = self.coalesce_ms / 1000
+        self.bindings: dict[str, Binding] = {
+            b.command.info.label: b for b in self.keyweave_layout.bindings
+        }
+
+    def _intercept(self, name: str) -> None:
+        _fire(self.bindings[name])
+        self.layout._pipeline.join()
+
+    def _setup(self, name: str) -> None:
+        # Undo needs something to undo, redo needs something to redo, and
+        # the MRU commands need a desktop to go back to.
+        if name in ("undo_pan", "redo_pan", "jump_mru", "cycle_top"):
+            self._intercept("pan_right")
+        if name == "redo_pan":
+            self._intercept("undo_pan")
+
+    def run_command(self, name: str) -> dict[str, Any]:
+        samples: list[float] = []
+        calls: Counter[str] = Counter()
+        time_ns: Counter[str] = Counter()
+        frames = hud_ns = 0
+        for _ in range(self.iterations):
+            self._setup(name)
+            calls_before = self.backend.calls.copy()
+            time_before = self.backend.time_ns.copy()
+            frames_before, hud_before = self.root.frames, self.root.time_ns
+            start = perf_counter_ns()
+            self._intercept(name)
+            samples.append((perf_counter_ns() - start) / 1000)
+            calls.update(self.backend.calls - calls_before)
+            time_ns.update(self.backend.time_ns - time_before)
+            frames += self.root.frames - frames_before
+            hud_ns += self.root.time_ns - hud_before
+
+        peaks: list[int] = []
+        blocks: list[int] = []
+        for _ in range(_ALLOC_RUNS):
+            peak, new_blocks = self._measure_allocations(name)
+            peaks.append(peak)
+            blocks.append(new_blocks)
+
+        n = self.iterations
+        q = statistics.quantiles(samples, n=100) if n > 1 else samples * 99
+        return {
+            "p50_us": _percentile(q, 50),
+            "p95_us": _percentile(q, 95),
+            "p99_us": _percentile(q, 99),
+            "mean_us": statistics.fmean(samples),
+            "backend_calls": calls.total() / n,
+            "backend": {
+                k: {"calls": calls[k] / n, "us": time_ns[k] / n / 1000}
+                for k in sorted(calls)
+            },
+            "hud_frames": frames / n,
+            "hud_us": hud_ns / n / 1000,
+            "alloc_peak_bytes": statistics.median_low(peaks),
+            "alloc_new_blocks": statistics.median_low(blocks),
+        }
+
+    def _measure_allocations(self, name: str) -> tuple[int, int]:
+        """
+        Peak bytes and new memory blocks allocated by one run of `name`.
+        """
+        tracemalloc.start()
+        try:
+            self._setup(name)
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            self._intercept(name)
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        blocks = sum(
+            max(s.count_diff, 0) for s in after.compare_to(before, "lineno")
+        )
+        return peak - base, blocks
+
+    def run(self, only: list[str] | None) -> dict[str, Any]:
+        names = only or [n for n in self.bindings if n not in _SKIP]
+        return {name: self.run_command(name) for name in names}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_table(
+    results: dict[str, Any], baseline: dict[str, Any] | None
+) -> None:
+    print(
+        f"{'command':<14}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}"
+        f"{'calls':>8}{'allocB':>10}" + (f"{'p50 Δ':>10}" if baseline else "")
+    )
+    for name, r in results.items():
+        line = (
+            f"{name:<14}{r['p50_us']:>10.1f}{r['p95_us']:>10.1f}"
+            f"{r['p99_us']:>10.1f}{r['backend_calls']:>8.1f}"
+            f"{r['alloc_peak_bytes']:>10}"
+        )
+        if baseline and name in baseline:
+            old = baseline[name]["p50_us"]
+            line += f"{(r['p50_us'] / old - 1) * 100 if old else 0:>+9.1f}%"
+        print(line)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=(__doc__ or "").splitlines()[1]
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="simulated latency of every backend call",
+    )
+    parser.add_argument(
+        "--hud", action="store_true", help="render the real HUD window"
+    )
+    parser.add_argument(
+        "--coalesce-ms",
+        type=float,
+        default=0.0,
+        help="how long pans wait to be merged with the next press",
+    )
+    parser.add_argument(
+        "--com-worker",
+        action="store_true",
+        help="make backend calls through a ComWorker, like the real backend",
+    )
+    parser.add_argument(
+        "--columns",
+        type=int,
+        default=3,
+        help="desktops per row of the grid the 9 desktops are laid out in",
+    )
+    parser.add_argument("--only", nargs="*", help="commands to run")
+    parser.add_argument("--out", default="bench-results.json")
+    parser.add_argument("--compare", help="previous results to compare with")
+    args = parser.parse_args(argv)
+
+    bench = Bench(
+        args.iterations,
+        args.latency_ms,
+        args.hud,
+        args.coalesce_ms,
+        args.com_worker,
+        args.columns,
+    )
+    results = bench.run(args.only)
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            "iterations": args.iterations,
+            "latency_ms": args.latency_ms,
+            "hud": args.hud,
+            "coalesce_ms": args.coalesce_ms,
+            "com_worker": args.com_worker,
+            "columns": args.columns,
+        },
+        "commands": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare and os.path.exists(args.compare):
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["commands"]
+    _print_table(results, baseline)
+
+
+if __name__ == "__main__":
+    main()